@@ -0,0 +1,193 @@
+"""Drive a codetour-mcp server over stdio with concurrent tool calls and report latency.
+
+The server is spawned through its codetour_mcp.server:main entry point in a temporary
+workspace holding small and huge tours, then driven over real MCP stdio framing with a
+configurable mix of reads and mutations. Nothing touches the network.
+
+Usage: python benchmarks/loadtest.py [--requests N] [--concurrency N] [--read-ratio R] ...
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+from codetour_mcp.core import save_tour
+
+READ_TOOLS = ("read_tour", "list_steps", "get_step", "preview_steps")
+MUTATION_TOOLS = ("update_step", "insert_step", "remove_step")
+
+
+def make_workspace(root: Path, small_tours: int, small_steps: int, huge_tours: int, huge_steps: int) -> dict:
+    """Write the source file and tours used by the load test; returns tour paths by size."""
+    source = root / "src" / "app.py"
+    source.parent.mkdir(parents=True)
+    source.write_text("".join(f"def function_{i}():\n    return {i}\n\n" for i in range(1000)), encoding="utf-8")
+
+    tours = {"small": [], "huge": []}
+    for size, count, steps in (("small", small_tours, small_steps), ("huge", huge_tours, huge_steps)):
+        for n in range(count):
+            path = f".tours/{size}-{n}.tour"
+            step_list = [
+                {"file": "src/app.py", "pattern": f"def function_{i % 1000}\\(", "description": f"Step {i}"}
+                for i in range(steps)
+            ]
+            save_tour(str(root / path), {"title": f"{size} tour {n}", "steps": step_list})
+            tours[size].append(path)
+    return tours
+
+
+def pick_call(rng: random.Random, tours: dict, args: argparse.Namespace) -> tuple[str, str, dict]:
+    """Choose the next tool call; returns (label, tool name, arguments)."""
+    size = "huge" if tours["huge"] and rng.random() < args.huge_ratio else "small"
+    tour_path = rng.choice(tours[size])
+    step_count = args.huge_steps if size == "huge" else args.small_steps
+    # Stay within the first half of the tour so concurrent removals never run out of steps
+    index = rng.randrange(max(step_count // 2, 1))
+
+    if rng.random() < args.read_ratio:
+        name = rng.choice(READ_TOOLS)
+        arguments = {
+            "read_tour": {"path": tour_path},
+            "list_steps": {"tour_path": tour_path},
+            "get_step": {"tour_path": tour_path, "index": index},
+            "preview_steps": {"tour_path": tour_path, "start": index, "end": index + 5},
+        }[name]
+    else:
+        name = rng.choices(MUTATION_TOOLS, weights=(3, 1, 1))[0]
+        arguments = {
+            "update_step": {"tour_path": tour_path, "index": index, "description": f"Edited {rng.random()}"},
+            "insert_step": {
+                "tour_path": tour_path,
+                "index": index,
+                "file": "src/app.py",
+                "pattern_regex": "def function_0\\(",
+                "description": "Inserted",
+            },
+            "remove_step": {"tour_path": tour_path, "index": index},
+        }[name]
+    return f"{name} ({size})", name, arguments
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Return a percentile of already sorted values, by nearest rank."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(fraction * len(sorted_values))) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarise(latencies: list[float], errors: int, elapsed: float) -> dict:
+    """Summarise latencies (in seconds) as milliseconds, with throughput and error rate."""
+    ordered = sorted(latencies)
+    total = len(ordered)
+    return {
+        "requests": total,
+        "errors": errors,
+        "error_rate": errors / total if total else 0.0,
+        "throughput": total / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(ordered, 0.50) * 1000,
+        "p95_ms": percentile(ordered, 0.95) * 1000,
+        "p99_ms": percentile(ordered, 0.99) * 1000,
+        "max_ms": (ordered[-1] if ordered else 0.0) * 1000,
+    }
+
+
+async def run_load(workspace: Path, tours: dict, args: argparse.Namespace) -> dict:
+    """Spawn the server, drive it and return the summary overall and per call type."""
+    server = StdioServerParameters(
+        command=sys.executable,
+        args=["-c", "from codetour_mcp.server import main; main()", *args.server_args],
+        cwd=str(workspace),
+    )
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    rng = random.Random(args.seed)
+    remaining = args.requests
+
+    async with stdio_client(server) as (read_stream, write_stream), ClientSession(read_stream, write_stream) as session:
+        await session.initialize()
+        for _ in range(args.warmup):
+            _, name, arguments = pick_call(rng, tours, args)
+            await session.call_tool(name, arguments)
+
+        async def worker():
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                label, name, arguments = pick_call(rng, tours, args)
+                start = time.perf_counter()
+                try:
+                    result = await session.call_tool(name, arguments)
+                    failed = result.isError
+                except Exception:
+                    failed = True
+                latencies[label].append(time.perf_counter() - start)
+                if failed:
+                    errors[label] += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+
+    all_latencies = [latency for values in latencies.values() for latency in values]
+    return {
+        "elapsed_s": elapsed,
+        "overall": summarise(all_latencies, sum(errors.values()), elapsed),
+        "by_call": {label: summarise(latencies[label], errors[label], elapsed) for label in sorted(latencies)},
+    }
+
+
+def print_report(report: dict) -> None:
+    """Print the summary as a table."""
+    header = f"{'call':<28}{'requests':>9}{'errors':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    print(header)
+    print("-" * len(header))
+    rows = [*report["by_call"].items(), ("overall", report["overall"])]
+    for label, stats in rows:
+        print(
+            f"{label:<28}{stats['requests']:>9}{stats['errors']:>8}{stats['throughput']:>9.1f}"
+            f"{stats['p50_ms']:>9.2f}{stats['p95_ms']:>9.2f}{stats['p99_ms']:>9.2f}"
+        )
+    print(f"\n{report['overall']['requests']} requests in {report['elapsed_s']:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000, help="Total tool calls to make")
+    parser.add_argument("--concurrency", type=int, default=8, help="Tool calls in flight at once")
+    parser.add_argument("--read-ratio", type=float, default=0.8, help="Fraction of calls that only read")
+    parser.add_argument("--huge-ratio", type=float, default=0.1, help="Fraction of calls that target huge tours")
+    parser.add_argument("--small-tours", type=int, default=20, help="Number of small tours")
+    parser.add_argument("--small-steps", type=int, default=20, help="Steps per small tour")
+    parser.add_argument("--huge-tours", type=int, default=2, help="Number of huge tours")
+    parser.add_argument("--huge-steps", type=int, default=5000, help="Steps per huge tour")
+    parser.add_argument("--warmup", type=int, default=50, help="Sequential calls made before measuring")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the call mix")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument(
+        "server_args", nargs="*", help="Extra arguments for the server, after '--' (e.g. -- --validation strict)"
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workspace = Path(tmp)
+        tours = make_workspace(workspace, args.small_tours, args.small_steps, args.huge_tours, args.huge_steps)
+        report = asyncio.run(run_load(workspace, tours, args))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
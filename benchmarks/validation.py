@@ -0,0 +1,87 @@
+"""Measure schema validation cost relative to loading and saving a large tour.
+
+Usage: python benchmarks/validation.py [--steps N] [--repeat N]
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from codetour_mcp import core
+from codetour_mcp.core import load_tour, save_tour
+from codetour_mcp.schema import LENIENT, STRICT, validate_tour
+
+
+def make_tour(step_count: int) -> dict:
+    """Build a tour mixing pattern, line and directory steps."""
+    steps = []
+    for i in range(step_count):
+        step = {"file": f"src/module_{i % 500}.py", "description": f"Step {i} explains what this code does. " * 3}
+        if i % 3 == 0:
+            step["line"] = i % 1000 + 1
+        elif i % 3 == 1:
+            step["pattern"] = f"def function_{i}\\("
+            step["title"] = f"Function {i}"
+        else:
+            step["directory"] = f"src/package_{i % 50}"
+        steps.append(step)
+    return {"$schema": "https://aka.ms/codetour-schema", "title": "Benchmark Tour", "steps": steps}
+
+
+def best_of(repeat: int, func) -> float:
+    """Return the fastest of several timed runs, in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=50_000, help="Steps in the generated tour")
+    parser.add_argument("--repeat", type=int, default=7, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+
+    tour_data = make_tour(args.steps)
+    with tempfile.TemporaryDirectory() as tmp:
+        tour_path = str(Path(tmp) / "benchmark.tour")
+        Path(tour_path).write_text(json.dumps(tour_data, indent=2), encoding="utf-8")
+        size = Path(tour_path).stat().st_size
+
+        def cold_load(mode):
+            # Forget which content has been validated, so every run pays for the full check
+            core._validated_digests.clear()
+            load_tour(tour_path, validation=mode)
+
+        loads = {mode: best_of(args.repeat, lambda mode=mode: cold_load(mode)) for mode in (LENIENT, STRICT)}
+        load = loads[LENIENT]
+        print(f"{args.steps} steps, {size / 1024 / 1024:.1f} MiB")
+        print(f"load_tour (lenient):         {load * 1000:8.2f} ms")
+        overhead = loads[STRICT] / load - 1
+        print(f"load_tour (strict):          {loads[STRICT] * 1000:8.2f} ms  ({overhead:+6.2%} vs lenient load)")
+        for mode in (LENIENT, STRICT):
+            validate = best_of(args.repeat, lambda mode=mode: validate_tour(tour_data, mode))
+            print(f"validate_tour ({mode:>7}):     {validate * 1000:8.2f} ms  ({validate / load:6.2%} of lenient load)")
+
+        # An edit writes new content, so the digest cache cannot help; only the changed step is checked
+        edited = load_tour(tour_path, validation=STRICT)
+        saves = {}
+        for mode in (LENIENT, STRICT):
+            counter = iter(range(10**9))
+
+            def edit_and_save(mode=mode, counter=counter):
+                edited["steps"][0]["description"] = f"Edited {next(counter)} ({mode})"
+                save_tour(tour_path, edited, validation=mode, changed_steps=[0])
+
+            saves[mode] = best_of(args.repeat, edit_and_save)
+        overhead = saves[STRICT] / saves[LENIENT] - 1
+        print(f"save_tour (lenient, 1 edit): {saves[LENIENT] * 1000:8.2f} ms")
+        print(f"save_tour (strict, 1 edit):  {saves[STRICT] * 1000:8.2f} ms  ({overhead:+6.2%} vs lenient save)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,253 @@
 """Core functionality for managing CodeTour files."""
 
+import hashlib
 import json
+import os
+import stat
+import tempfile
+from collections import OrderedDict
+from collections.abc import Iterable
 from pathlib import Path
 from typing import Any
 
+from .merge import TourConflictError
+from .schema import LENIENT, STRICT, VALIDATION_MODES, validate_tour
 
-def load_tour(tour_path: str) -> dict[str, Any]:
-    """Load a tour file from the given path."""
+# Content digests of tour files this process has read or written, keyed by path and
+# validated against the file's (mtime_ns, size) so external edits are never missed.
+_file_digests: dict[str, tuple[int, int, str]] = {}
+
+# Recently seen tour file contents by digest, so an edit based on an older version can
+# still be merged into the current one
+_recent_versions: OrderedDict[str, bytes] = OrderedDict()
+_recent_versions_bytes = 0
+_MAX_RECENT_VERSIONS_BYTES = 64 * 1024 * 1024
+
+# The process umask, read once at import, for the permissions of newly created tour files
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# Default expected_digest for save_tour: whatever the file holds when the save starts
+CURRENT_VERSION = object()
+
+# Validation applied by load_tour and save_tour when no mode is passed
+_validation_mode = LENIENT
+
+# Content digests already validated, mapped to the mode they passed, so unchanged
+# content is only validated once
+_validated_digests: dict[str, str] = {}
+_MAX_VALIDATED_DIGESTS = 1024
+
+
+def set_validation_mode(mode: str) -> None:
+    """Set the default validation mode ("strict" or "lenient") for loading and saving tours."""
+    global _validation_mode
+    if mode not in VALIDATION_MODES:
+        raise ValueError(f"Unknown validation mode: {mode} (expected one of {', '.join(VALIDATION_MODES)})")
+    _validation_mode = mode
+
+
+def serialize_tour(tour_data: dict[str, Any]) -> str:
+    """Serialise a tour exactly as save_tour writes it."""
+    return json.dumps(tour_data, indent=2, ensure_ascii=False) + "\n"
+
+
+def content_hash(content: bytes) -> str:
+    """Return the digest used to identify a tour file's content."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def _validate(
+    tour_data: Any,
+    digest: str,
+    mode: str | None,
+    changed_steps: Iterable[int] | None = None,
+    base_digest: str | None = None,
+) -> None:
+    mode = mode or _validation_mode
+    if _validated_digests.get(digest) in (mode, STRICT):
+        return
+    if _validated_digests.get(base_digest) not in (mode, STRICT):
+        # Only an edit of content that has itself passed can skip its unchanged steps
+        changed_steps = None
+    validate_tour(tour_data, mode, only_steps=changed_steps)
+    if len(_validated_digests) >= _MAX_VALIDATED_DIGESTS:
+        _validated_digests.clear()
+    _validated_digests[digest] = mode
+
+
+def _remember_version(digest: str, content: bytes) -> None:
+    global _recent_versions_bytes
+    if digest in _recent_versions:
+        _recent_versions.move_to_end(digest)
+        return
+    _recent_versions[digest] = content
+    _recent_versions_bytes += len(content)
+    while _recent_versions_bytes > _MAX_RECENT_VERSIONS_BYTES and len(_recent_versions) > 1:
+        _recent_versions_bytes -= len(_recent_versions.popitem(last=False)[1])
+
+
+def _remember_digest(path: Path, digest: str, file_stat: os.stat_result) -> None:
+    _file_digests[str(path)] = (file_stat.st_mtime_ns, file_stat.st_size, digest)
+
+
+def _read_file(path: Path) -> tuple[bytes, os.stat_result]:
+    """Read a file along with the stat of the very file that was read.
+
+    The stat is taken from the open file before reading, so a write that lands meanwhile can
+    only make a cached digest look out of date, never make an old digest look current.
+    """
+    with path.open("rb") as f:
+        file_stat = os.fstat(f.fileno())
+        return f.read(), file_stat
+
+
+def load_tour_version(digest: str) -> dict[str, Any] | None:
+    """Return a tour version this process recently read or wrote, or None if it is not known."""
+    content = _recent_versions.get(digest)
+    return None if content is None else json.loads(content)
+
+
+def file_digest(tour_path: str) -> str | None:
+    """Return the content digest of a tour file, or None if it does not exist.
+
+    The file is only read when it has changed since this process last read or wrote it.
+    """
+    path = Path(tour_path)
+    try:
+        file_stat = path.stat()
+        cached = _file_digests.get(str(path))
+        if cached and cached[:2] == (file_stat.st_mtime_ns, file_stat.st_size):
+            return cached[2]
+        content, file_stat = _read_file(path)
+    except FileNotFoundError:
+        return None
+
+    digest = content_hash(content)
+    _remember_digest(path, digest, file_stat)
+    _remember_version(digest, content)
+    return digest
+
+
+def load_tour(tour_path: str, validation: str | None = None) -> dict[str, Any]:
+    """Load a tour file from the given path.
+
+    Raises TourValidationError if the tour does not pass validation (by default, the mode
+    set with set_validation_mode).
+    """
+    return load_tour_with_digest(tour_path, validation)[0]
+
+
+def load_tour_with_digest(tour_path: str, validation: str | None = None) -> tuple[dict[str, Any], str]:
+    """Load a tour like load_tour, also returning the content digest of what was loaded.
+
+    Passing that digest to save_tour as expected_digest makes the save fail if the file has
+    changed since.
+    """
     path = Path(tour_path)
     if not path.exists():
         raise FileNotFoundError(f"Tour file not found: {tour_path}")
 
-    with open(path, encoding="utf-8") as f:
-        return json.load(f)
+    content, file_stat = _read_file(path)
+    digest = content_hash(content)
+    tour_data = json.loads(content)
+    _validate(tour_data, digest, validation)
+    _remember_digest(path, digest, file_stat)
+    _remember_version(digest, content)
+    return tour_data, digest
+
+
+def load_tour_uncached(tour_path: str, validation: str | None = None) -> dict[str, Any]:
+    """Load and validate a tour like load_tour, without recording it in this process's caches.
+
+    Meant for bulk reads: it is safe to call from worker threads, and does not evict the
+    recent versions that concurrent edits are merged against.
+    """
+    tour_data = json.loads(Path(tour_path).read_bytes())
+    validate_tour(tour_data, validation or _validation_mode)
+    return tour_data
 
 
-def save_tour(tour_path: str, tour_data: dict[str, Any]) -> None:
-    """Save a tour file to the given path."""
+def save_tour(
+    tour_path: str,
+    tour_data: dict[str, Any],
+    validation: str | None = None,
+    changed_steps: Iterable[int] | None = None,
+    expected_digest: str | None | object = CURRENT_VERSION,
+) -> bool:
+    """Save a tour file to the given path.
+
+    The tour is validated before writing, as in load_tour. changed_steps may list the indices of
+    the only steps that differ from the version the edit was based on (for example after a
+    single-step edit); if that version has already passed validation, only those steps and the
+    tour's own fields are checked. Returns False without touching the file when the edit changes
+    nothing, so editors and file watchers are not woken by no-op edits.
+
+    expected_digest is the digest of the version the edit was based on (see
+    load_tour_with_digest), or None if the file did not exist. TourConflictError is raised if
+    the file no longer has it, both before writing and again just before the file is
+    atomically replaced. By default the file is expected to keep the content it has when the
+    save starts.
+    """
     path = Path(tour_path)
-    path.parent.mkdir(parents=True, exist_ok=True)
+    content = serialize_tour(tour_data).encode("utf-8")
+    digest = content_hash(content)
+    current = file_digest(tour_path)
+    if expected_digest is CURRENT_VERSION:
+        expected_digest = current
+    _validate(tour_data, digest, validation, changed_steps, expected_digest)
+    _remember_version(digest, content)
+
+    # Nothing to write if the edit changed nothing, or the file already holds its result
+    if digest in (expected_digest, current):
+        return False
+    if current != expected_digest:
+        raise TourConflictError(_conflict_message(path, expected_digest, current))
+
+    _remember_digest(path, digest, _replace_file(path, content, expected_digest))
+    return True
+
+
+def _conflict_message(path: Path, expected_digest: str | None, current: str | None) -> str:
+    return f"Tour {path} was changed by another writer (expected hash {expected_digest}, current {current})"
+
+
+def _replace_file(path: Path, content: bytes, expected_digest: str | None) -> os.stat_result:
+    """Write content to path atomically, unless the file no longer has expected_digest.
+
+    Returns the stat of the new file, taken before it was renamed into place so that it
+    cannot describe a later write.
+
+    The content goes to a temporary file in the same directory that is then renamed over the
+    target, so other processes (editors, other servers) see either the old or the new file,
+    never a partial one. The digest is checked again just before the rename, which catches
+    another process writing while this content was being prepared.
+    """
+    # Replace a symlink's target rather than the link itself
+    target = Path(os.path.realpath(path))
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        mode = stat.S_IMODE(target.stat().st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+
+    fd, temp_path = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.chmod(temp_path, mode)
+        file_stat = os.stat(temp_path)
+        current = file_digest(str(path))
+        if current != expected_digest:
+            raise TourConflictError(_conflict_message(path, expected_digest, current))
+        os.replace(temp_path, target)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+    return file_stat
+
 
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(tour_data, f, indent=2, ensure_ascii=False)
-        f.write("\n")
+def delete_tour(tour_path: str) -> None:
+    """Delete a tour file if it exists."""
+    Path(tour_path).unlink(missing_ok=True)
+    _file_digests.pop(str(Path(tour_path)), None)
@@ -0,0 +1,212 @@
+"""Asynchronous, cached access to the source files referenced by tour steps."""
+
+import asyncio
+import mmap
+import os
+import re
+import stat
+import sys
+import threading
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MMAP_THRESHOLD = 4 * 1024 * 1024
+DEFAULT_MAX_WORKERS = 4
+
+
+def _line_offsets(buffer: Any) -> array:
+    """Return the offset at which each line of the buffer (text, bytes or mmap) starts."""
+    newline = "\n" if isinstance(buffer, str) else b"\n"
+    offsets = array("q", [0])
+    find = buffer.find
+    pos = find(newline)
+    while pos != -1:
+        offsets.append(pos + 1)
+        pos = find(newline, pos + 1)
+    if offsets[-1] == len(buffer):
+        # A trailing newline ends the last line rather than starting a new one
+        offsets.pop()
+    return offsets
+
+
+class SourceFile:
+    """A source file's line-offset table and, for small files, its decoded text.
+
+    Small files are decoded once when loaded, and their offsets index the text, so repeated
+    pattern searches and line reads never decode the file again. Files at or above the mmap
+    threshold are scanned through mmap, their offsets are byte offsets and their contents are
+    not kept in memory; reading lines from them goes back to disk, so those calls should run
+    off the event loop.
+    """
+
+    def __init__(self, path: str, mtime_ns: int, size: int, offsets: array, text: str | None):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.offsets = offsets
+        self.text = text
+
+    @classmethod
+    def load(cls, path: str, file_stat: os.stat_result, mmap_threshold: int) -> "SourceFile":
+        """Read a file, mapping it instead of reading it when it is large."""
+        with open(path, "rb") as f:
+            if file_stat.st_size and file_stat.st_size >= mmap_threshold:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return cls(path, file_stat.st_mtime_ns, file_stat.st_size, _line_offsets(mm), None)
+            text = f.read().decode("utf-8", errors="replace")
+        return cls(path, file_stat.st_mtime_ns, file_stat.st_size, _line_offsets(text), text)
+
+    @property
+    def is_mapped(self) -> bool:
+        """Whether the contents live on disk rather than in memory."""
+        return self.text is None
+
+    @property
+    def line_count(self) -> int:
+        return len(self.offsets)
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by this entry."""
+        text_bytes = 0 if self.text is None else sys.getsizeof(self.text)
+        return text_bytes + self.offsets.itemsize * len(self.offsets)
+
+    def read_lines(self, start: int, end: int) -> list[str]:
+        """Return lines start..end (0-based, end exclusive) without line endings."""
+        start = max(start, 0)
+        end = min(end, self.line_count)
+        if start >= end:
+            return []
+
+        begin = self.offsets[start]
+        if self.text is not None:
+            chunk = self.text[begin : self.offsets[end] if end < self.line_count else len(self.text)]
+        else:
+            stop = self.offsets[end] if end < self.line_count else self.size
+            with open(self.path, "rb") as f:
+                f.seek(begin)
+                chunk = f.read(stop - begin).decode("utf-8", errors="replace")
+
+        lines = chunk.split("\n")[: end - start]
+        return [line.removesuffix("\r") for line in lines]
+
+    def find(self, pattern: str) -> int | None:
+        """Return the 0-based line of the first match of a multiline regex, or None.
+
+        Mapped files are searched as bytes, so character classes such as \\w only match ASCII there.
+        """
+        if self.text is not None:
+            match = re.search(pattern, self.text, re.MULTILINE)
+        else:
+            regex = re.compile(pattern.encode("utf-8"), re.MULTILINE)
+            with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                match = regex.search(mm)
+        return None if match is None else bisect_right(self.offsets, match.start()) - 1
+
+
+class SourceFileCache:
+    """Size-bounded LRU cache of source files, loaded on a thread pool.
+
+    Entries are keyed by path and only reused while the file's (mtime, size) is unchanged.
+    Concurrent requests for the same path share a single read.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        mmap_threshold: int = DEFAULT_MMAP_THRESHOLD,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ):
+        self.max_bytes = max_bytes
+        self.mmap_threshold = mmap_threshold
+        self.max_workers = max_workers
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, SourceFile] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._pending: dict[str, asyncio.Future] = {}
+        self._executor: ThreadPoolExecutor | None = None
+
+    async def get(self, path: str | os.PathLike) -> SourceFile | None:
+        """Return the cached file, loading it if needed; None if it is not a regular file."""
+        key = os.fspath(path)
+        pending = self._pending.get(key)
+        if pending is None or pending.done():
+            pending = asyncio.ensure_future(self.run(self._get_sync, key))
+            self._pending[key] = pending
+            pending.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(pending)
+
+    async def read_lines(self, path: str | os.PathLike, start: int, end: int) -> list[str] | None:
+        """Return lines start..end (0-based, end exclusive) of a file, or None if it is missing."""
+        source = await self.get(path)
+        if source is None:
+            return None
+        if source.is_mapped:
+            return await self.run(source.read_lines, start, end)
+        return source.read_lines(start, end)
+
+    async def find(self, path: str | os.PathLike, pattern: str) -> int | None:
+        """Return the 0-based line of the first regex match in a file, or None."""
+        source = await self.get(path)
+        if source is None:
+            return None
+        return await self.run(source.find, pattern)
+
+    async def exists(self, path: str | os.PathLike) -> bool:
+        """Check whether a file or directory exists without blocking the event loop."""
+        return await self.run(os.path.exists, path)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def close(self) -> None:
+        """Shut down the thread pool; it is recreated on next use."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def run(self, func, *args):
+        """Run a blocking call on the cache's thread pool."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="codetour-files")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, partial(func, *args))
+
+    def _get_sync(self, key: str) -> SourceFile | None:
+        try:
+            file_stat = os.stat(key)
+        except (FileNotFoundError, NotADirectoryError):
+            return None
+        if not stat.S_ISREG(file_stat.st_mode):
+            return None
+
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and (cached.mtime_ns, cached.size) == (file_stat.st_mtime_ns, file_stat.st_size):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+
+        source = SourceFile.load(key, file_stat, self.mmap_threshold)
+
+        with self._lock:
+            self.misses += 1
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            if source.nbytes <= self.max_bytes:
+                self._entries[key] = source
+                self._bytes += source.nbytes
+                while self._bytes > self.max_bytes:
+                    _, evicted = self._entries.popitem(last=False)
+                    self._bytes -= evicted.nbytes
+        return source
@@ -0,0 +1,259 @@
+"""Undo/redo history for tour edits, stored as reversible deltas."""
+
+import copy
+import json
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from typing import Any
+
+DEFAULT_MAX_ENTRIES = 200
+DEFAULT_MAX_BYTES = 1024 * 1024
+
+# Bounds on the logs kept across all tours
+DEFAULT_MAX_TOURS = 64
+DEFAULT_MAX_TOTAL_BYTES = 16 * 1024 * 1024
+
+
+def insert_step_delta(index: int, step: dict[str, Any]) -> dict[str, Any]:
+    """Build a delta recording that a step was inserted at the given index."""
+    return {"op": "insert_step", "index": index, "step": copy.deepcopy(step)}
+
+
+def remove_step_delta(index: int, step: dict[str, Any]) -> dict[str, Any]:
+    """Build a delta recording that a step was removed from the given index."""
+    return {"op": "remove_step", "index": index, "step": copy.deepcopy(step)}
+
+
+def update_step_delta(index: int, before: dict[str, Any], after: dict[str, Any]) -> dict[str, Any]:
+    """Build a delta recording changed step fields.
+
+    Only the fields that changed are stored; a value of None means the field was absent.
+    """
+    return {"op": "update_step", "index": index, "before": dict(before), "after": dict(after)}
+
+
+def replace_tour_delta(before: dict[str, Any] | None, after: dict[str, Any] | None) -> dict[str, Any]:
+    """Build a delta recording a whole-tour replacement; None means the file did not exist."""
+    return {"op": "replace_tour", "before": copy.deepcopy(before), "after": copy.deepcopy(after)}
+
+
+def delta_changed_steps(delta: dict[str, Any]) -> list[int] | None:
+    """Return the indices of the steps a delta leaves changed, or None if it replaces the whole tour."""
+    op = delta["op"]
+    if op in ("insert_step", "update_step"):
+        return [delta["index"]]
+    if op == "remove_step":
+        return []
+    return None
+
+
+def invert_delta(delta: dict[str, Any]) -> dict[str, Any]:
+    """Return the delta that reverses the given one."""
+    op = delta["op"]
+    if op == "insert_step":
+        return {**delta, "op": "remove_step"}
+    if op == "remove_step":
+        return {**delta, "op": "insert_step"}
+    if op in ("update_step", "replace_tour"):
+        return {**delta, "before": delta["after"], "after": delta["before"]}
+    raise ValueError(f"Unknown history operation: {op}")
+
+
+def apply_delta(tour_data: dict[str, Any] | None, delta: dict[str, Any]) -> dict[str, Any] | None:
+    """Apply a delta to a tour and return the resulting tour.
+
+    Step-level deltas modify tour_data in place. Before applying, the parts of the tour the
+    delta touches are checked against what the delta expects, so a tour edited outside the
+    history raises ValueError instead of being silently corrupted.
+    """
+    op = delta["op"]
+
+    if op == "replace_tour":
+        if tour_data != delta["before"]:
+            raise ValueError("Tour no longer matches its recorded state")
+        return copy.deepcopy(delta["after"])
+
+    if tour_data is None:
+        raise ValueError("Tour file no longer exists")
+
+    steps = tour_data.setdefault("steps", [])
+    index = delta["index"]
+
+    if op == "insert_step":
+        if index < 0 or index > len(steps):
+            raise ValueError(f"Step index {index} no longer valid for insertion")
+        steps.insert(index, copy.deepcopy(delta["step"]))
+    elif op == "remove_step":
+        if index < 0 or index >= len(steps) or steps[index] != delta["step"]:
+            raise ValueError(f"Step at index {index} no longer matches its recorded state")
+        steps.pop(index)
+    elif op == "update_step":
+        if index < 0 or index >= len(steps):
+            raise ValueError(f"Step index {index} no longer exists")
+        step = steps[index]
+        if any(step.get(key) != value for key, value in delta["before"].items()):
+            raise ValueError(f"Step at index {index} no longer matches its recorded state")
+        for key, value in delta["after"].items():
+            if value is None:
+                step.pop(key, None)
+            else:
+                step[key] = value
+    else:
+        raise ValueError(f"Unknown history operation: {op}")
+
+    return tour_data
+
+
+def describe_delta(delta: dict[str, Any]) -> str:
+    """Return a short human-readable description of a delta."""
+    if delta["op"] == "replace_tour":
+        return "replace_tour"
+    return f"{delta['op']} at index {delta['index']}"
+
+
+class TourHistory:
+    """Bounded undo/redo log for a single tour.
+
+    Each entry stores only the changed step (or changed fields), so recording an edit costs
+    O(changed step) regardless of tour size. The oldest entries are evicted once either
+    max_entries or max_bytes (measured on the serialised deltas) is exceeded.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._undo: deque[tuple[dict[str, Any], int]] = deque()
+        self._redo: list[tuple[dict[str, Any], int]] = []
+        self._bytes = 0
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self._undo)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self._redo)
+
+    @property
+    def size(self) -> int:
+        """Serialised size in bytes of all undoable and redoable deltas."""
+        return self._bytes + sum(size for _, size in self._redo)
+
+    def record(self, delta: dict[str, Any]) -> None:
+        """Record a new edit, discarding any redoable entries."""
+        self._push_undo((delta, len(json.dumps(delta, ensure_ascii=False))))
+        self._redo.clear()
+
+    def undo(
+        self, tour_data: dict[str, Any] | None, save: Callable[[dict[str, Any] | None], Any] | None = None
+    ) -> tuple[dict[str, Any], dict[str, Any] | None]:
+        """Reverse the most recent edit.
+
+        Returns the undone delta and the resulting tour (None if the tour should not exist).
+        tour_data is not modified. If save is given it is called with the resulting tour, and
+        the entry only moves to the redo stack once it returns, so a failed save leaves the log
+        as it was. If the tour was modified outside the history, the log is cleared and
+        ValueError raised.
+        """
+        if not self._undo:
+            raise ValueError("Nothing to undo")
+        entry = self._undo[-1]
+        tour_data = self._apply(tour_data, invert_delta(entry[0]))
+        if save is not None:
+            save(tour_data)
+        self._undo.pop()
+        self._bytes -= entry[1]
+        self._redo.append(entry)
+        return entry[0], tour_data
+
+    def redo(
+        self, tour_data: dict[str, Any] | None, save: Callable[[dict[str, Any] | None], Any] | None = None
+    ) -> tuple[dict[str, Any], dict[str, Any] | None]:
+        """Re-apply the most recently undone edit, saving it as in undo."""
+        if not self._redo:
+            raise ValueError("Nothing to redo")
+        entry = self._redo[-1]
+        tour_data = self._apply(tour_data, entry[0])
+        if save is not None:
+            save(tour_data)
+        self._redo.pop()
+        self._push_undo(entry)
+        return entry[0], tour_data
+
+    def clear(self) -> None:
+        """Drop all recorded entries."""
+        self._undo.clear()
+        self._redo.clear()
+        self._bytes = 0
+
+    def entries(self) -> dict[str, list[str]]:
+        """Describe the undoable and redoable edits, most recent first."""
+        return {
+            "undo": [describe_delta(delta) for delta, _ in reversed(self._undo)],
+            "redo": [describe_delta(delta) for delta, _ in reversed(self._redo)],
+        }
+
+    def _apply(self, tour_data: dict[str, Any] | None, delta: dict[str, Any]) -> dict[str, Any] | None:
+        try:
+            return apply_delta(copy.deepcopy(tour_data), delta)
+        except ValueError as e:
+            self.clear()
+            raise ValueError(f"{e}; tour was modified outside of history, history cleared") from e
+
+    def _push_undo(self, entry: tuple[dict[str, Any], int]) -> None:
+        self._undo.append(entry)
+        self._bytes += entry[1]
+        while len(self._undo) > 1 and (len(self._undo) > self.max_entries or self._bytes > self.max_bytes):
+            self._bytes -= self._undo.popleft()[1]
+
+
+class TourHistories:
+    """Undo/redo logs for many tours, keyed by tour path, bounded in total.
+
+    Logs are only created by recording an edit, so looking a tour up never grows the store.
+    Once more than max_tours logs are kept, or their combined size exceeds max_bytes, the
+    least recently used logs are dropped; the log just recorded into is always kept.
+    """
+
+    def __init__(
+        self,
+        max_tours: int = DEFAULT_MAX_TOURS,
+        max_bytes: int = DEFAULT_MAX_TOTAL_BYTES,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_entry_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.max_tours = max_tours
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.max_entry_bytes = max_entry_bytes
+        self._logs: OrderedDict[str, TourHistory] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._logs)
+
+    def __contains__(self, tour_path: str) -> bool:
+        return tour_path in self._logs
+
+    def get(self, tour_path: str) -> TourHistory | None:
+        """Return the log for a tour, or None if no edit to it has been recorded."""
+        history = self._logs.get(tour_path)
+        if history is not None:
+            self._logs.move_to_end(tour_path)
+        return history
+
+    def record(self, tour_path: str, delta: dict[str, Any]) -> None:
+        """Record an edit to a tour, creating its log if needed."""
+        history = self.get(tour_path)
+        if history is None:
+            history = self._logs[tour_path] = TourHistory(self.max_entries, self.max_entry_bytes)
+        history.record(delta)
+        self._evict()
+
+    def clear(self) -> None:
+        """Drop every log."""
+        self._logs.clear()
+
+    def _evict(self) -> None:
+        total = sum(history.size for history in self._logs.values())
+        while len(self._logs) > 1 and (len(self._logs) > self.max_tours or total > self.max_bytes):
+            total -= self._logs.popitem(last=False)[1].size
@@ -0,0 +1,204 @@
+"""Step-level diff and three-way merge of tours.
+
+Steps are matched by identity (the location they point at) rather than by index, so inserting
+or removing a step does not make every later step look changed.
+"""
+
+import json
+from bisect import bisect_left
+from collections.abc import Hashable
+from typing import Any
+
+# Fields that identify which code a step points at
+IDENTITY_FIELDS = ("file", "directory", "uri", "pattern", "line")
+
+
+class TourConflictError(ValueError):
+    """Raised when a tour changed since the version an edit was based on."""
+
+
+def _hashable(value: Any) -> Hashable:
+    # Arrays and objects (which only a malformed step holds here) are keyed by their JSON
+    return json.dumps(value, sort_keys=True) if isinstance(value, (list, dict)) else value
+
+
+def step_identity(step: dict[str, Any]) -> tuple[Hashable, ...]:
+    """Return the identity of a step: the location it points at."""
+    return tuple(_hashable(step.get(field)) for field in IDENTITY_FIELDS)
+
+
+def _describe_location(step: dict[str, Any]) -> dict[str, Any]:
+    return {field: step[field] for field in IDENTITY_FIELDS if step.get(field) is not None}
+
+
+def _keyed_steps(steps: list[dict[str, Any]]) -> dict[tuple, int]:
+    """Map each step's identity (with an occurrence count for repeats) to its index."""
+    seen: dict[tuple, int] = {}
+    keyed = {}
+    for index, step in enumerate(steps):
+        identity = step_identity(step)
+        occurrence = seen.get(identity, 0)
+        seen[identity] = occurrence + 1
+        keyed[(identity, occurrence)] = index
+    return keyed
+
+
+def _longest_increasing(values: list[int]) -> set[int]:
+    """Return the positions of a longest strictly increasing subsequence, in O(n log n)."""
+    tails: list[int] = []
+    tail_positions: list[int] = []
+    previous = [-1] * len(values)
+    for position, value in enumerate(values):
+        slot = bisect_left(tails, value)
+        if slot == len(tails):
+            tails.append(value)
+            tail_positions.append(position)
+        else:
+            tails[slot] = value
+            tail_positions[slot] = position
+        previous[position] = tail_positions[slot - 1] if slot else -1
+
+    kept = set()
+    position = tail_positions[-1] if tail_positions else -1
+    while position != -1:
+        kept.add(position)
+        position = previous[position]
+    return kept
+
+
+def _field_changes(old: dict[str, Any], new: dict[str, Any], skip: tuple[str, ...] = ()) -> dict[str, Any]:
+    return {
+        key: {"old": old.get(key), "new": new.get(key)}
+        for key in dict.fromkeys([*old, *new])
+        if key not in skip and old.get(key) != new.get(key)
+    }
+
+
+def diff_tours(old: dict[str, Any], new: dict[str, Any]) -> dict[str, Any]:
+    """Describe how new differs from old.
+
+    Returns changed tour fields and the steps that were added, removed, modified or moved,
+    with step indices into the respective tour.
+    """
+    old_steps = old.get("steps", [])
+    new_steps = new.get("steps", [])
+    old_keyed = _keyed_steps(old_steps)
+    new_keyed = _keyed_steps(new_steps)
+
+    removed = [{"index": i, "step": old_steps[i]} for key, i in old_keyed.items() if key not in new_keyed]
+    added = [{"index": j, "step": new_steps[j]} for key, j in new_keyed.items() if key not in old_keyed]
+
+    common = [(old_keyed[key], j) for key, j in new_keyed.items() if key in old_keyed]
+    modified = []
+    for i, j in common:
+        changes = _field_changes(old_steps[i], new_steps[j])
+        if changes:
+            modified.append({"old_index": i, "new_index": j, "changes": changes})
+
+    # Steps outside a longest run that kept its relative order are the ones that moved
+    in_order = _longest_increasing([i for i, _ in common])
+    moved = [{"old_index": i, "new_index": j} for position, (i, j) in enumerate(common) if position not in in_order]
+
+    return {
+        "fields": _field_changes(old, new, skip=("steps",)),
+        "added": added,
+        "removed": removed,
+        "modified": modified,
+        "moved": moved,
+    }
+
+
+def _merge_values(base: Any, ours: Any, theirs: Any) -> tuple[Any, bool]:
+    """Three-way merge of one value; returns the result and whether it conflicted."""
+    if ours == theirs or theirs == base:
+        return ours, False
+    if ours == base:
+        return theirs, False
+    return ours, True
+
+
+def _merge_dicts(
+    base: dict[str, Any], ours: dict[str, Any], theirs: dict[str, Any], skip: tuple[str, ...] = ()
+) -> tuple[dict[str, Any], list[str]]:
+    missing = object()
+    merged = {}
+    conflicts = []
+    for key in dict.fromkeys([*ours, *theirs, *base]):
+        if key in skip:
+            continue
+        value, conflicted = _merge_values(base.get(key, missing), ours.get(key, missing), theirs.get(key, missing))
+        if conflicted:
+            conflicts.append(key)
+        if value is not missing:
+            merged[key] = value
+    return merged, conflicts
+
+
+def merge_tours(
+    base: dict[str, Any], ours: dict[str, Any], theirs: dict[str, Any]
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """Three-way merge two tours that were both edited from base.
+
+    Changes made on only one side are applied. Where both sides changed the same field
+    differently, or one side deleted a step the other modified, ours wins (a modified step is
+    kept) and the conflict is reported. The result follows ours' step order, with steps
+    added by theirs placed after the step that precedes them in theirs.
+    """
+    merged, field_conflicts = _merge_dicts(base, ours, theirs, skip=("steps",))
+    conflicts: list[dict[str, Any]] = [{"field": key} for key in field_conflicts]
+
+    base_steps = base.get("steps", [])
+    our_steps = ours.get("steps", [])
+    their_steps = theirs.get("steps", [])
+    base_keyed = _keyed_steps(base_steps)
+    our_keyed = _keyed_steps(our_steps)
+    their_keyed = _keyed_steps(their_steps)
+
+    def merged_step(key: tuple) -> dict[str, Any] | None:
+        """Merge one step across the three versions; None means it is deleted."""
+        base_step = base_steps[base_keyed[key]] if key in base_keyed else None
+        our_step = our_steps[our_keyed[key]] if key in our_keyed else None
+        their_step = their_steps[their_keyed[key]] if key in their_keyed else None
+
+        if our_step is not None and their_step is not None:
+            step, step_conflicts = _merge_dicts(base_step or {}, our_step, their_step)
+            conflicts.extend({"step": _describe_location(our_step), "field": field} for field in step_conflicts)
+            return step
+        survivor = our_step if our_step is not None else their_step
+        if base_step is None:
+            # Added on one side only
+            return survivor
+        if survivor == base_step:
+            # Deleted on one side, untouched on the other
+            return None
+        conflicts.append({"step": _describe_location(survivor), "reason": "modified and deleted"})
+        return survivor
+
+    steps_by_key = {}
+    order = []
+    for key in our_keyed:
+        step = merged_step(key)
+        if step is not None:
+            steps_by_key[key] = step
+            order.append(key)
+
+    # Place steps only theirs still has after the nearest preceding step that ours also kept
+    following: dict[tuple | None, list[tuple]] = {}
+    anchor = None
+    for key in their_keyed:
+        if key in our_keyed:
+            if key in steps_by_key:
+                anchor = key
+            continue
+        step = merged_step(key)
+        if step is not None:
+            steps_by_key[key] = step
+            following.setdefault(anchor, []).append(key)
+
+    steps = [steps_by_key[key] for key in following.get(None, [])]
+    for key in order:
+        steps.append(steps_by_key[key])
+        steps.extend(steps_by_key[k] for k in following.get(key, []))
+
+    merged["steps"] = steps
+    return merged, conflicts
@@ -0,0 +1,75 @@
+"""Canonical paths for the tours and directories tools are pointed at."""
+
+import os
+from pathlib import Path
+
+DEFAULT_MAX_ENTRIES = 4096
+
+
+class WorkspacePaths:
+    """Resolve user-supplied paths against a workspace root, memoised per root.
+
+    Relative paths are taken from the workspace root, or from the current directory when
+    no root is set. Paths are resolved through symlinks, so every spelling of the same file
+    (``./.tours/a.tour``, ``.tours/a.tour``, an absolute path, a path through a symlinked
+    directory) maps to one canonical string that per-file state can be keyed by.
+
+    Only paths that exist are memoised: a missing path may later be created, possibly as a
+    symlink, so it is resolved afresh each time. Call clear() if existing symlinks are
+    repointed while the server runs.
+    """
+
+    def __init__(self, root: str | Path | None = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._root: Path | None = None
+        self._resolved: dict[Path, dict[str, str]] = {}
+        self.hits = 0
+        self.misses = 0
+        if root is not None:
+            self.set_root(root)
+
+    def set_root(self, root: str | Path | None) -> None:
+        """Set the workspace root; None follows the current directory."""
+        if root is not None:
+            root = Path(root).resolve(strict=True)
+            if not root.is_dir():
+                raise NotADirectoryError(f"Workspace root is not a directory: {root}")
+        self._root = root
+
+    @property
+    def root(self) -> Path:
+        """The workspace root that relative paths are resolved against."""
+        return self._root or Path.cwd()
+
+    def resolve(self, path: str | Path) -> str:
+        """Return the canonical absolute path for path."""
+        root = self.root
+        resolved = self._resolved.setdefault(root, {})
+        key = os.fspath(path)
+        canonical = resolved.get(key)
+        if canonical is not None:
+            self.hits += 1
+            return canonical
+
+        self.misses += 1
+        candidate = root / key
+        try:
+            canonical = str(candidate.resolve(strict=True))
+        except (FileNotFoundError, NotADirectoryError):
+            return str(candidate.resolve())
+
+        if len(resolved) >= self.max_entries:
+            resolved.clear()
+        resolved[key] = canonical
+        return canonical
+
+    def relative(self, path: str | Path) -> str:
+        """Return path relative to the workspace root when it lies inside it, else as given."""
+        try:
+            return Path(path).relative_to(self.root).as_posix()
+        except ValueError:
+            return str(path)
+
+    def clear(self) -> None:
+        """Forget all memoised resolutions."""
+        self._resolved.clear()
@@ -0,0 +1,165 @@
+"""Code previews for tour steps."""
+
+import asyncio
+import json
+import re
+from pathlib import Path
+from typing import Any
+
+from .files import SourceFile, SourceFileCache
+
+DEFAULT_CONTEXT_LINES = 3
+DEFAULT_MAX_BYTES = 64 * 1024
+
+# Lines longer than this (such as in minified files) are cut short in previews
+MAX_LINE_LENGTH = 1000
+CLIPPED_MARKER = "..."
+
+
+async def locate_step(step: dict[str, Any], source: SourceFile, cache: SourceFileCache) -> int:
+    """Return the 0-based line a step points at, the way CodeTour resolves it.
+
+    An explicit line wins over a pattern; a step with neither points at the top of the file.
+    """
+    if "line" in step:
+        try:
+            return max(int(step["line"]) - 1, 0)
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError(f"Invalid line: {step['line']!r}") from None
+    if "pattern" in step:
+        if not isinstance(step["pattern"], str):
+            raise ValueError(f"Invalid pattern: {step['pattern']!r}")
+        try:
+            line = await cache.run(source.find, step["pattern"])
+        except re.error as e:
+            raise ValueError(f"Invalid pattern: {e}") from e
+        if line is None:
+            raise ValueError("Pattern not found")
+        return line
+    return 0
+
+
+# Preview fields besides the lines that are cut short when a preview alone exceeds max_bytes
+CLIPPED_FIELDS = ("file", "directory", "error")
+
+# Room left for the {"steps": [...], "truncated": ..., "next_index": ...} around the previews
+ENVELOPE_BYTES = 64
+
+
+def _preview_size(preview: dict[str, Any]) -> int:
+    """Measure a preview as the server serialises it: ASCII-escaped, nested two levels deep at indent 2."""
+    text = json.dumps(preview, indent=2)
+    return len(text) + 4 * (text.count("\n") + 1) + 2
+
+
+def _clip_line(line: str, length: int) -> str:
+    return line if len(line) <= length else line[: max(length, 0)] + CLIPPED_MARKER
+
+
+def _clip_to_budget(preview: dict[str, Any], budget: int) -> dict[str, Any]:
+    """Shrink a preview's text so it fits in budget, narrowing to the step's own line first."""
+    clipped = {**preview, "clipped": True}
+    texts = {}
+    for field in CLIPPED_FIELDS:
+        if field in preview:
+            value = preview[field]
+            # A value of the wrong type (reported as an error) is shown as JSON so it can be cut too
+            texts[field] = value if isinstance(value, str) else json.dumps(value)
+    own = []
+    if "lines" in preview:
+        target = preview["line"] - preview["startLine"]
+        own = preview["lines"][target : target + 1]
+        clipped["startLine"] = preview["line"]
+
+    def fill(room: int) -> None:
+        for field, text in texts.items():
+            clipped[field] = _clip_line(text, room)
+        if "lines" in preview:
+            clipped["lines"] = [_clip_line(line, room) for line in own]
+
+    fill(0)
+    base = _preview_size(clipped)
+    room = budget - base
+    while True:
+        fill(room)
+        size = _preview_size(clipped)
+        if size <= budget or room <= 0:
+            return clipped
+        # Escaped characters take more than one byte each, so scale down to what is left for the text
+        room = min(room - 1, room * (budget - base) // (size - base))
+
+
+async def preview_steps(
+    steps: list[dict[str, Any]],
+    cache: SourceFileCache,
+    start: int = 0,
+    end: int | None = None,
+    context: int = DEFAULT_CONTEXT_LINES,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    root: str | Path = ".",
+) -> dict[str, Any]:
+    """Preview the code under steps start..end (end exclusive).
+
+    Each distinct file is read once, concurrently. Steps that cannot be resolved get an
+    "error" entry rather than failing the call. Previews stop once the response would exceed
+    max_bytes; the result then has "truncated" set and "next_index" to resume from. Lines
+    longer than MAX_LINE_LENGTH are cut short, as is a first preview that alone exceeds
+    max_bytes (its lines and its file, directory and error strings); such previews are marked
+    "clipped".
+    """
+    end = len(steps) if end is None else min(end, len(steps))
+    start = max(start, 0)
+    root = Path(root)
+
+    files = {step["file"] for step in steps[start:end] if isinstance(step.get("file"), str)}
+    sources = dict(zip(files, await asyncio.gather(*(cache.get(root / file) for file in files)), strict=True))
+
+    previews = []
+    size = ENVELOPE_BYTES
+    for index in range(start, end):
+        step = steps[index]
+        preview: dict[str, Any] = {"index": index}
+
+        if "file" not in step:
+            if "directory" in step:
+                preview["directory"] = step["directory"]
+        elif not isinstance(step["file"], str):
+            preview["file"] = step["file"]
+            preview["error"] = "Invalid file: expected a string"
+        else:
+            preview["file"] = step["file"]
+            source = sources[step["file"]]
+            if source is None:
+                preview["error"] = "File not found"
+            else:
+                try:
+                    line = await locate_step(step, source, cache)
+                except ValueError as e:
+                    preview["error"] = str(e)
+                else:
+                    first = max(line - context, 0)
+                    last = line + context + 1
+                    if source.is_mapped:
+                        lines = await cache.run(source.read_lines, first, last)
+                    else:
+                        lines = source.read_lines(first, last)
+                    preview["line"] = line + 1
+                    preview["startLine"] = first + 1
+                    preview["lines"] = [_clip_line(text, MAX_LINE_LENGTH) for text in lines]
+                    if any(len(text) > MAX_LINE_LENGTH for text in lines):
+                        preview["clipped"] = True
+
+        preview_size = _preview_size(preview)
+        if size + preview_size > max_bytes:
+            if previews:
+                return {"steps": previews, "truncated": True, "next_index": index}
+            # Even the first preview must fit, so it is cut down rather than left out
+            previews.append(_clip_to_budget(preview, max_bytes - ENVELOPE_BYTES))
+            result = {"steps": previews, "truncated": True}
+            if index + 1 < end:
+                result["next_index"] = index + 1
+            return result
+        size += preview_size
+        previews.append(preview)
+
+    return {"steps": previews, "truncated": False}
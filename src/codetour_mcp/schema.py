@@ -0,0 +1,196 @@
+"""Validation of tours against the CodeTour schema.
+
+The schema (https://raw.githubusercontent.com/microsoft/codetour/refs/heads/main/schema.json)
+is small and fixed, so instead of interpreting it with a generic validator on every call its
+rules are compiled at import into tables of allowed types. Whole-tour checks then make a
+single pass over each step's fields, and edits can limit the check to the steps they changed;
+the slower walk that builds error messages only runs once something has failed.
+"""
+
+import math
+from collections.abc import Iterable
+from typing import Any
+
+STRICT = "strict"
+LENIENT = "lenient"
+VALIDATION_MODES = (STRICT, LENIENT)
+
+MAX_REPORTED_ERRORS = 20
+
+_NUMBER = (int, float)
+
+# Allowed value types for top-level tour fields and for step fields
+_TOUR_FIELD_TYPES: dict[str, tuple[type, ...]] = {
+    "$schema": (str,),
+    "title": (str,),
+    "description": (str,),
+    "ref": (str,),
+    "isPrimary": (bool,),
+    "nextTour": (str,),
+    "stepMarker": (str,),
+    "when": (str,),
+    "steps": (list,),
+}
+_TOUR_REQUIRED = ("title", "steps")
+
+_STEP_FIELD_TYPES: dict[str, tuple[type, ...]] = {
+    "file": (str,),
+    "directory": (str,),
+    "uri": (str,),
+    "title": (str,),
+    "description": (str,),
+    "line": _NUMBER,
+    "pattern": (str,),
+    "view": (str,),
+    "contents": (str,),
+    "selection": (dict,),
+    "commands": (list,),
+}
+_STEP_REQUIRED = ("description",)
+
+# Step fields the tools read, whose types lenient mode checks too
+_LENIENT_STEP_FIELDS = ("file", "directory", "title", "description", "pattern", "line")
+
+# Step fields whose values need checking beyond their type
+_STEP_VALUE_CHECKED_FIELDS = frozenset({"line", "selection", "commands"})
+
+
+class _StepRules:
+    """The step fields a validation mode checks, split by how much checking each needs."""
+
+    def __init__(self, field_types: dict[str, tuple[type, ...]], required: tuple[str, ...]):
+        self.field_types = field_types
+        self.required = required
+        # Fields that need no checks beyond their type, for the single-pass fast check
+        self.fast_types = {
+            key: frozenset(types) for key, types in field_types.items() if key not in _STEP_VALUE_CHECKED_FIELDS
+        }
+        self.checked_types = {key: types for key, types in field_types.items() if key in _STEP_VALUE_CHECKED_FIELDS}
+
+
+_STEP_RULES = {
+    STRICT: _StepRules(_STEP_FIELD_TYPES, _STEP_REQUIRED),
+    LENIENT: _StepRules({key: _STEP_FIELD_TYPES[key] for key in _LENIENT_STEP_FIELDS}, ()),
+}
+
+
+class TourValidationError(ValueError):
+    """Raised when a tour does not conform to the CodeTour schema."""
+
+    def __init__(self, errors: list[str]):
+        self.errors = errors
+        shown = "; ".join(errors[:MAX_REPORTED_ERRORS])
+        more = len(errors) - MAX_REPORTED_ERRORS
+        super().__init__(f"Invalid tour: {shown}" + (f" (and {more} more)" if more > 0 else ""))
+
+
+def _type_name(types: tuple[type, ...]) -> str:
+    names = {str: "string", bool: "boolean", int: "number", float: "number", list: "array", dict: "object"}
+    return " or ".join(dict.fromkeys(names[t] for t in types))
+
+
+def _is_instance(value: Any, types: tuple[type, ...]) -> bool:
+    # type() rather than isinstance() so that booleans are not accepted as numbers
+    return type(value) in types
+
+
+def _position_errors(path: str, position: Any) -> list[str]:
+    if type(position) is not dict:
+        return [f"{path}: expected object"]
+    return [
+        f"{path}.{key}: expected number"
+        for key in ("line", "character")
+        if key not in position or not _is_instance(position[key], _NUMBER)
+    ]
+
+
+def _field_errors(path: str, key: str, value: Any, types: tuple[type, ...]) -> list[str]:
+    if not _is_instance(value, types):
+        return [f"{path}.{key}: expected {_type_name(types)}"]
+    if key == "line" and type(value) is float and not math.isfinite(value):
+        return [f"{path}.line: expected finite number"]
+    if key == "selection":
+        return [
+            *_position_errors(f"{path}.selection.start", value.get("start")),
+            *_position_errors(f"{path}.selection.end", value.get("end")),
+        ]
+    if key == "commands" and not all(type(command) is str for command in value):
+        return [f"{path}.commands: expected array of strings"]
+    return []
+
+
+def _step_errors(index: int, step: Any, rules: _StepRules) -> list[str]:
+    """Describe everything wrong with one step."""
+    path = f"steps[{index}]"
+    if type(step) is not dict:
+        return [f"{path}: expected object"]
+
+    errors = [f"{path}.{key}: required" for key in rules.required if key not in step]
+    for key, value in step.items():
+        types = rules.field_types.get(key)
+        if types is not None:
+            errors.extend(_field_errors(path, key, value, types))
+    return errors
+
+
+def _steps_valid(steps: list[Any], rules: _StepRules) -> bool:
+    """Fast check that every step conforms, without locating errors.
+
+    One pass over each step's fields; fields needing checks beyond their type are left out
+    of the type table so that only they take the slower path.
+    """
+    fast_types = rules.fast_types.get
+    checked_types = rules.checked_types
+    for step in steps:
+        if type(step) is not dict:
+            return False
+        for key in rules.required:
+            if key not in step:
+                return False
+        for key, value in step.items():
+            types = fast_types(key)
+            if types is None:
+                if key in checked_types and _field_errors("", key, value, checked_types[key]):
+                    return False
+            elif type(value) not in types:
+                return False
+    return True
+
+
+def validate_tour(tour_data: Any, mode: str = STRICT, only_steps: Iterable[int] | None = None) -> None:
+    """Check a tour against the CodeTour schema, raising TourValidationError if it does not conform.
+
+    Lenient mode only rejects tours the tools cannot work with: a non-object tour, steps that
+    are not an array or not objects, and steps whose file, directory, title, description,
+    pattern or line has the wrong type (line must be a finite number). Strict mode also
+    enforces required fields and the types of every schema field. Given only_steps, just those
+    step indices are checked (the others are known to conform already) along with the tour's
+    own fields.
+    """
+    if mode not in VALIDATION_MODES:
+        raise ValueError(f"Unknown validation mode: {mode} (expected one of {', '.join(VALIDATION_MODES)})")
+
+    if type(tour_data) is not dict:
+        raise TourValidationError(["tour: expected object"])
+
+    steps = tour_data.get("steps", [])
+    if type(steps) is not list:
+        raise TourValidationError(["steps: expected array"])
+
+    errors = []
+    if mode == STRICT:
+        errors.extend(f"{key}: required" for key in _TOUR_REQUIRED if key not in tour_data)
+        for key, value in tour_data.items():
+            types = _TOUR_FIELD_TYPES.get(key)
+            if types is not None and not _is_instance(value, types):
+                errors.append(f"{key}: expected {_type_name(types)}")
+
+    rules = _STEP_RULES[mode]
+    indices = range(len(steps)) if only_steps is None else list(only_steps)
+    checked = steps if only_steps is None else [steps[index] for index in indices]
+    if not _steps_valid(checked, rules):
+        for index in indices:
+            errors.extend(_step_errors(index, steps[index], rules))
+
+    if errors:
+        raise TourValidationError(errors)
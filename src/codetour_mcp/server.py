@@ -1,5 +1,7 @@
 """CodeTour MCP Server - Main implementation."""
 
+import asyncio
+import copy
 import json
 from pathlib import Path
 from typing import Any
@@ -8,10 +10,145 @@ import mcp.server.stdio
 from mcp.server import Server
 from mcp.types import TextContent, Tool
 
-from .core import load_tour, save_tour
+from .core import (
+    delete_tour,
+    file_digest,
+    load_tour,
+    load_tour_version,
+    load_tour_with_digest,
+    save_tour,
+    set_validation_mode,
+)
+from .files import SourceFileCache
+from .history import (
+    TourHistories,
+    TourHistory,
+    delta_changed_steps,
+    describe_delta,
+    insert_step_delta,
+    remove_step_delta,
+    replace_tour_delta,
+    update_step_delta,
+)
+from .merge import TourConflictError, diff_tours, merge_tours
+from .paths import WorkspacePaths
+from .preview import DEFAULT_CONTEXT_LINES, DEFAULT_MAX_BYTES, preview_steps
+from .schema import LENIENT, VALIDATION_MODES
+from .stats import DEFAULT_TOP, tour_stats
 
 app = Server("codetour-mcp")
 
+EXPECTED_HASH_PROPERTY = {
+    "expected_hash": {
+        "type": "string",
+        "description": "Only edit if the tour's content hash still matches (see read_tour with_hash)",
+    }
+}
+ON_CONFLICT_PROPERTY = {
+    "on_conflict": {
+        "type": "string",
+        "enum": ["reject", "merge"],
+        "description": "When expected_hash no longer matches: reject the edit (default), or apply it to "
+        "the expected version and three-way merge it into the current tour",
+    }
+}
+CONCURRENCY_PROPERTIES = {**EXPECTED_HASH_PROPERTY, **ON_CONFLICT_PROPERTY}
+
+# Resolves the paths tools are given to canonical paths, which all per-tour state is keyed by
+workspace = WorkspacePaths()
+
+# Undo/redo logs, keyed by canonical tour path
+histories = TourHistories()
+
+# Shared cache of the source files that steps point at
+source_files = SourceFileCache()
+
+
+def load_tour_if_exists(tour_path: str) -> tuple[dict[str, Any] | None, str | None]:
+    """Load a tour and its content digest, or return (None, None) if the file does not exist."""
+    return load_tour_with_digest(tour_path) if Path(tour_path).exists() else (None, None)
+
+
+def load_for_edit(
+    tour_path: str,
+    arguments: dict[str, Any],
+    must_exist: bool = True,
+    allow_merge: bool = True,
+    replace_unreadable: bool = False,
+) -> tuple[dict[str, Any] | None, str | None, tuple[dict[str, Any], dict[str, Any]] | None]:
+    """Load the tour a mutating tool should edit, enforcing the optional expected_hash.
+
+    Returns the tour to edit, the digest of the file content the edit is based on (which
+    save_edit checks again before writing) and, when expected_hash names an older version and
+    on_conflict is "merge", the (base, latest) pair the edited tour must be merged into. With
+    replace_unreadable, a file that does not parse or validate is edited as if it did not exist.
+    """
+    try:
+        latest, current = load_tour_with_digest(tour_path) if must_exist else load_tour_if_exists(tour_path)
+    except ValueError:
+        if not replace_unreadable:
+            raise
+        latest, current = None, file_digest(tour_path)
+    expected = arguments.get("expected_hash")
+    if expected is None or expected == current:
+        return latest, current, None
+
+    message = f"Tour {tour_path} has changed (expected hash {expected}, current {current})"
+    if not allow_merge or arguments.get("on_conflict", "reject") != "merge":
+        raise TourConflictError(message)
+    base = load_tour_version(expected)
+    if base is None or latest is None:
+        raise TourConflictError(f"{message}; the expected version is not known, so it cannot be merged")
+    # The edit is applied to its own copy of the base, which must stay intact for the merge
+    return copy.deepcopy(base), current, (base, latest)
+
+
+def save_edit(
+    tour_path: str,
+    tour_data: dict[str, Any],
+    based_on: str | None,
+    merge_into: tuple[dict[str, Any], dict[str, Any]] | None,
+    delta: dict[str, Any] | None,
+    arguments: dict[str, Any],
+) -> str:
+    """Save an edited tour and record it in the history.
+
+    based_on is the digest load_for_edit returned. If the file changed after it was loaded, the
+    edit is rejected, or with on_conflict "merge" it is merged into the file's new content.
+    When merge_into is given, the edit is first three-way merged into the latest version and
+    recorded as a whole-tour replacement. Returns the note to append to the tool's result.
+    """
+    conflicts = None
+    if merge_into is None:
+        # Only the steps the edit touched need validating; no delta means nothing changed
+        changed_steps = [] if delta is None else delta_changed_steps(delta)
+        try:
+            written = save_tour(tour_path, tour_data, changed_steps=changed_steps, expected_digest=based_on)
+        except TourConflictError:
+            base = None if based_on is None else load_tour_version(based_on)
+            if arguments.get("on_conflict", "reject") != "merge" or base is None:
+                raise
+            latest, based_on = load_tour_with_digest(tour_path)
+            merge_into = (base, latest)
+        else:
+            if delta is not None:
+                histories.record(tour_path, delta)
+    if merge_into is not None:
+        base, latest = merge_into
+        tour_data, conflicts = merge_tours(base, tour_data, latest)
+        written = save_tour(tour_path, tour_data, expected_digest=based_on)
+        if tour_data != latest:
+            histories.record(tour_path, replace_tour_delta(latest, tour_data))
+
+    notes = [] if written else ["unchanged"]
+    if conflicts is not None:
+        notes.append(f"merged with concurrent changes, {len(conflicts)} conflict{'' if len(conflicts) == 1 else 's'}")
+    notes.append(f"hash: {file_digest(tour_path)}")
+    note = f" ({'; '.join(notes)})"
+    if conflicts:
+        note += "\nConflicts (kept this edit): " + json.dumps(conflicts)
+    return note
+
 
 @app.list_tools()
 async def list_tools() -> list[Tool]:
@@ -26,6 +163,7 @@ async def list_tools() -> list[Tool]:
                     "path": {"type": "string", "description": "Path to the tour file (e.g., '.tours/my-tour.tour')"},
                     "title": {"type": "string", "description": "Title of the tour"},
                     "description": {"type": "string", "description": "Optional description of the tour"},
+                    **CONCURRENCY_PROPERTIES,
                 },
                 "required": ["path", "title"],
             },
@@ -35,7 +173,13 @@ async def list_tools() -> list[Tool]:
             description="Read a complete tour object from a file",
             inputSchema={
                 "type": "object",
-                "properties": {"path": {"type": "string", "description": "Path to the tour file"}},
+                "properties": {
+                    "path": {"type": "string", "description": "Path to the tour file"},
+                    "with_hash": {
+                        "type": "boolean",
+                        "description": "Return {hash, tour} so the hash can be passed as expected_hash to edits",
+                    },
+                },
                 "required": ["path"],
             },
         ),
@@ -49,6 +193,20 @@ async def list_tools() -> list[Tool]:
                 },
             },
         ),
+        Tool(
+            name="tour_stats",
+            description="Compute statistics across all tours under a directory in one pass",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "root": {"type": "string", "description": "Directory to search recursively (default: '.')"},
+                    "top": {
+                        "type": "number",
+                        "description": f"Most referenced files and directories to list (default: {DEFAULT_TOP})",
+                    },
+                },
+            },
+        ),
         Tool(
             name="list_steps",
             description="List all steps in a tour",
@@ -70,6 +228,27 @@ async def list_tools() -> list[Tool]:
                 "required": ["tour_path", "index"],
             },
         ),
+        Tool(
+            name="preview_steps",
+            description="Show the code each step in a range points at, resolving its line or pattern",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "tour_path": {"type": "string", "description": "Path to the tour file"},
+                    "start": {"type": "number", "description": "First step index (0-based, default: 0)"},
+                    "end": {"type": "number", "description": "Step index to stop before (default: end of tour)"},
+                    "context": {
+                        "type": "number",
+                        "description": f"Lines to show around each step's line (default: {DEFAULT_CONTEXT_LINES})",
+                    },
+                    "max_bytes": {
+                        "type": "number",
+                        "description": f"Approximate response size limit (default: {DEFAULT_MAX_BYTES})",
+                    },
+                },
+                "required": ["tour_path"],
+            },
+        ),
         Tool(
             name="insert_step",
             description="Insert a step into a tour using pattern regex",
@@ -82,6 +261,7 @@ async def list_tools() -> list[Tool]:
                     "pattern_regex": {"type": "string", "description": "Regular expression to match in the file"},
                     "description": {"type": "string", "description": "Description of the step"},
                     "title": {"type": "string", "description": "Optional title for the step"},
+                    **CONCURRENCY_PROPERTIES,
                 },
                 "required": ["tour_path", "file", "pattern_regex", "description"],
             },
@@ -98,6 +278,7 @@ async def list_tools() -> list[Tool]:
                     "directory": {"type": "string", "description": "Directory path relative to workspace root"},
                     "description": {"type": "string", "description": "Description of the step"},
                     "title": {"type": "string", "description": "Optional title for the step"},
+                    **CONCURRENCY_PROPERTIES,
                 },
                 "required": ["tour_path", "file", "directory", "description"],
             },
@@ -112,6 +293,7 @@ async def list_tools() -> list[Tool]:
                     "index": {"type": "number", "description": "Step index (0-based)"},
                     "description": {"type": "string", "description": "New description"},
                     "title": {"type": "string", "description": "New title"},
+                    **CONCURRENCY_PROPERTIES,
                 },
                 "required": ["tour_path", "index"],
             },
@@ -124,10 +306,70 @@ async def list_tools() -> list[Tool]:
                 "properties": {
                     "tour_path": {"type": "string", "description": "Path to the tour file"},
                     "index": {"type": "number", "description": "Step index (0-based)"},
+                    **CONCURRENCY_PROPERTIES,
                 },
                 "required": ["tour_path", "index"],
             },
         ),
+        Tool(
+            name="undo",
+            description="Undo the most recent edit made to a tour through this server",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "tour_path": {"type": "string", "description": "Path to the tour file"},
+                    **EXPECTED_HASH_PROPERTY,
+                },
+                "required": ["tour_path"],
+            },
+        ),
+        Tool(
+            name="redo",
+            description="Redo the most recently undone edit to a tour",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "tour_path": {"type": "string", "description": "Path to the tour file"},
+                    **EXPECTED_HASH_PROPERTY,
+                },
+                "required": ["tour_path"],
+            },
+        ),
+        Tool(
+            name="history",
+            description="List the undoable and redoable edits for a tour, most recent first",
+            inputSchema={
+                "type": "object",
+                "properties": {"tour_path": {"type": "string", "description": "Path to the tour file"}},
+                "required": ["tour_path"],
+            },
+        ),
+        Tool(
+            name="diff_tours",
+            description="Compare two tours step by step, matching steps by the location they point at",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "old_path": {"type": "string", "description": "Path to the original tour file"},
+                    "new_path": {"type": "string", "description": "Path to the changed tour file"},
+                },
+                "required": ["old_path", "new_path"],
+            },
+        ),
+        Tool(
+            name="merge_tour",
+            description="Three-way merge another version of a tour into a tour file",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "tour_path": {"type": "string", "description": "Path to the tour file to merge into"},
+                    "base_path": {"type": "string", "description": "Path to the common ancestor version"},
+                    "other_path": {"type": "string", "description": "Path to the other edited version"},
+                    **EXPECTED_HASH_PROPERTY,
+                },
+                "required": ["tour_path", "base_path", "other_path"],
+            },
+        ),
     ]
 
 
@@ -136,7 +378,7 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
     """Handle tool calls."""
 
     if name == "create_tour":
-        path = arguments["path"]
+        path = workspace.resolve(arguments["path"])
         title = arguments["title"]
         description = arguments.get("description", "")
 
@@ -144,19 +386,23 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
         if description:
             tour_data["description"] = description
 
-        save_tour(path, tour_data)
+        # A broken tour file is rebuilt rather than refused, so it can always be recovered
+        previous, based_on, merge_into = load_for_edit(path, arguments, must_exist=False, replace_unreadable=True)
+        delta = replace_tour_delta(previous, tour_data) if previous != tour_data else None
+        note = save_edit(path, tour_data, based_on, merge_into, delta, arguments)
 
-        return [TextContent(type="text", text=f"Created tour '{title}' at {path}")]
+        return [TextContent(type="text", text=f"Created tour '{title}' at {arguments['path']}{note}")]
 
     elif name == "read_tour":
-        path = arguments["path"]
+        path = workspace.resolve(arguments["path"])
         tour_data = load_tour(path)
 
+        if arguments.get("with_hash"):
+            tour_data = {"hash": file_digest(path), "tour": tour_data}
         return [TextContent(type="text", text=json.dumps(tour_data, indent=2))]
 
     elif name == "list_tours":
-        dir_path = arguments.get("dir", ".tours")
-        tours_dir = Path(dir_path)
+        tours_dir = Path(workspace.resolve(arguments.get("dir", ".tours")))
 
         if not tours_dir.exists():
             return [TextContent(type="text", text=json.dumps([]))]
@@ -164,13 +410,15 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
         tours = []
         for tour_file in tours_dir.glob("*.tour"):
             try:
-                tour_data = load_tour(str(tour_file))
+                tour_path = workspace.resolve(tour_file)
+                tour_data = load_tour(tour_path)
                 tours.append(
                     {
-                        "path": str(tour_file),
+                        "path": workspace.relative(tour_file),
                         "title": tour_data.get("title", ""),
                         "description": tour_data.get("description", ""),
                         "stepCount": len(tour_data.get("steps", [])),
+                        "hash": file_digest(tour_path),
                     }
                 )
             except Exception:
@@ -178,8 +426,16 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
 
         return [TextContent(type="text", text=json.dumps(tours, indent=2))]
 
+    elif name == "tour_stats":
+        root = workspace.resolve(arguments.get("root", "."))
+        top = int(arguments.get("top", DEFAULT_TOP))
+
+        stats = await asyncio.to_thread(tour_stats, root, top)
+
+        return [TextContent(type="text", text=json.dumps(stats, separators=(",", ":")))]
+
     elif name == "list_steps":
-        tour_path = arguments["tour_path"]
+        tour_path = workspace.resolve(arguments["tour_path"])
         tour_data = load_tour(tour_path)
         steps = tour_data.get("steps", [])
 
@@ -206,7 +462,7 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
         return [TextContent(type="text", text=json.dumps(step_list, indent=2))]
 
     elif name == "get_step":
-        tour_path = arguments["tour_path"]
+        tour_path = workspace.resolve(arguments["tour_path"])
         index = int(arguments["index"])
 
         tour_data = load_tour(tour_path)
@@ -217,96 +473,166 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
 
         return [TextContent(type="text", text=json.dumps(steps[index], indent=2))]
 
+    elif name == "preview_steps":
+        tour_path = workspace.resolve(arguments["tour_path"])
+        start = int(arguments.get("start", 0))
+        end = arguments.get("end")
+        context = int(arguments.get("context", DEFAULT_CONTEXT_LINES))
+        max_bytes = int(arguments.get("max_bytes", DEFAULT_MAX_BYTES))
+
+        tour_data = load_tour(tour_path)
+        result = await preview_steps(
+            tour_data.get("steps", []),
+            source_files,
+            start=start,
+            end=int(end) if end is not None else None,
+            context=context,
+            max_bytes=max_bytes,
+            root=workspace.root,
+        )
+
+        return [TextContent(type="text", text=json.dumps(result, indent=2))]
+
     elif name == "insert_step":
-        tour_path = arguments["tour_path"]
+        tour_path = workspace.resolve(arguments["tour_path"])
         file = arguments["file"]
         pattern_regex = arguments["pattern_regex"]
         description = arguments["description"]
         title = arguments.get("title")
         index = arguments.get("index")
 
-        tour_data = load_tour(tour_path)
+        tour_data, based_on, merge_into = load_for_edit(tour_path, arguments)
         steps = tour_data.get("steps", [])
 
         step = {"file": file, "pattern": pattern_regex, "description": description}
         if title:
             step["title"] = title
 
-        if index is not None:
-            steps.insert(int(index), step)
-        else:
-            steps.append(step)
+        # Clamp as list.insert would, so the recorded delta names the index actually used
+        index = len(steps) if index is None else min(max(int(index), 0), len(steps))
+        steps.insert(index, step)
 
         tour_data["steps"] = steps
-        save_tour(tour_path, tour_data)
+        note = save_edit(tour_path, tour_data, based_on, merge_into, insert_step_delta(index, step), arguments)
 
-        actual_index = int(index) if index is not None else len(steps) - 1
-        return [TextContent(type="text", text=f"Inserted step at index {actual_index}")]
+        return [TextContent(type="text", text=f"Inserted step at index {index}{note}")]
 
     elif name == "insert_step_by_directory":
-        tour_path = arguments["tour_path"]
+        tour_path = workspace.resolve(arguments["tour_path"])
         file = arguments["file"]
         directory = arguments["directory"]
         description = arguments["description"]
         title = arguments.get("title")
         index = arguments.get("index")
 
-        tour_data = load_tour(tour_path)
+        tour_data, based_on, merge_into = load_for_edit(tour_path, arguments)
         steps = tour_data.get("steps", [])
 
         step = {"file": file, "directory": directory, "description": description}
         if title:
             step["title"] = title
 
-        if index is not None:
-            steps.insert(int(index), step)
-        else:
-            steps.append(step)
+        # Clamp as list.insert would, so the recorded delta names the index actually used
+        index = len(steps) if index is None else min(max(int(index), 0), len(steps))
+        steps.insert(index, step)
 
         tour_data["steps"] = steps
-        save_tour(tour_path, tour_data)
+        note = save_edit(tour_path, tour_data, based_on, merge_into, insert_step_delta(index, step), arguments)
 
-        actual_index = int(index) if index is not None else len(steps) - 1
-        return [TextContent(type="text", text=f"Inserted step at index {actual_index}")]
+        return [TextContent(type="text", text=f"Inserted step at index {index}{note}")]
 
     elif name == "update_step":
-        tour_path = arguments["tour_path"]
+        tour_path = workspace.resolve(arguments["tour_path"])
         index = int(arguments["index"])
         description = arguments.get("description")
         title = arguments.get("title")
 
-        tour_data = load_tour(tour_path)
+        tour_data, based_on, merge_into = load_for_edit(tour_path, arguments)
         steps = tour_data.get("steps", [])
 
         if index < 0 or index >= len(steps):
             raise IndexError(f"Step index {index} out of range (0-{len(steps) - 1})")
 
+        changes = {}
         if description is not None:
-            steps[index]["description"] = description
+            changes["description"] = description
         if title is not None:
-            steps[index]["title"] = title
+            changes["title"] = title
+        before = {key: steps[index].get(key) for key in changes}
+        steps[index].update(changes)
 
         tour_data["steps"] = steps
-        save_tour(tour_path, tour_data)
+        delta = update_step_delta(index, before, changes) if before != changes else None
+        note = save_edit(tour_path, tour_data, based_on, merge_into, delta, arguments)
 
-        return [TextContent(type="text", text=f"Updated step at index {index}")]
+        return [TextContent(type="text", text=f"Updated step at index {index}{note}")]
 
     elif name == "remove_step":
-        tour_path = arguments["tour_path"]
+        tour_path = workspace.resolve(arguments["tour_path"])
         index = int(arguments["index"])
 
-        tour_data = load_tour(tour_path)
+        tour_data, based_on, merge_into = load_for_edit(tour_path, arguments)
         steps = tour_data.get("steps", [])
 
         if index < 0 or index >= len(steps):
             raise IndexError(f"Step index {index} out of range (0-{len(steps) - 1})")
 
-        steps.pop(index)
+        removed = steps.pop(index)
 
         tour_data["steps"] = steps
-        save_tour(tour_path, tour_data)
+        note = save_edit(tour_path, tour_data, based_on, merge_into, remove_step_delta(index, removed), arguments)
+
+        return [TextContent(type="text", text=f"Removed step at index {index}{note}")]
+
+    elif name in ("undo", "redo"):
+        tour_path = workspace.resolve(arguments["tour_path"])
+        history = histories.get(tour_path)
+        if history is None or not (history.can_undo if name == "undo" else history.can_redo):
+            raise ValueError(f"Nothing to {name}")
+
+        tour_data, based_on, _ = load_for_edit(tour_path, arguments, must_exist=False, allow_merge=False)
+
+        def write(result: dict[str, Any] | None) -> None:
+            if result is None:
+                delete_tour(tour_path)
+            else:
+                save_tour(tour_path, result, expected_digest=based_on)
+
+        if name == "undo":
+            delta, tour_data = history.undo(tour_data, write)
+        else:
+            delta, tour_data = history.redo(tour_data, write)
+
+        verb = "Undid" if name == "undo" else "Redid"
+        return [TextContent(type="text", text=f"{verb} {describe_delta(delta)}")]
+
+    elif name == "history":
+        tour_path = workspace.resolve(arguments["tour_path"])
+        # Looking at a tour's history must not create a log for it
+        entries = (histories.get(tour_path) or TourHistory()).entries()
+
+        return [TextContent(type="text", text=json.dumps(entries, indent=2))]
+
+    elif name == "diff_tours":
+        old_data = load_tour(workspace.resolve(arguments["old_path"]))
+        new_data = load_tour(workspace.resolve(arguments["new_path"]))
+
+        return [TextContent(type="text", text=json.dumps(diff_tours(old_data, new_data), indent=2))]
+
+    elif name == "merge_tour":
+        tour_path = workspace.resolve(arguments["tour_path"])
+        base_data = load_tour(workspace.resolve(arguments["base_path"]))
+        other_data = load_tour(workspace.resolve(arguments["other_path"]))
+
+        tour_data, based_on, _ = load_for_edit(tour_path, arguments, allow_merge=False)
+        merged, conflicts = merge_tours(base_data, tour_data, other_data)
+        delta = replace_tour_delta(tour_data, merged) if merged != tour_data else None
+        note = save_edit(tour_path, merged, based_on, None, delta, arguments)
 
-        return [TextContent(type="text", text=f"Removed step at index {index}")]
+        summary = f"Merged {arguments['other_path']} into {arguments['tour_path']}{note}"
+        if conflicts:
+            summary += "\nConflicts (kept this tour's version): " + json.dumps(conflicts)
+        return [TextContent(type="text", text=summary)]
 
     else:
         raise ValueError(f"Unknown tool: {name}")
@@ -314,7 +640,39 @@ async def call_tool(name: str, arguments: Any) -> list[TextContent]:
 
 def main():
     """Main entry point for the server."""
-    import asyncio
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="codetour-mcp", description=__doc__)
+    parser.add_argument(
+        "--validation",
+        choices=VALIDATION_MODES,
+        default=LENIENT,
+        help="Schema validation applied when loading and saving tours (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--workspace-root",
+        metavar="DIR",
+        help="Directory that relative tour, directory and step file paths are resolved against "
+        "(default: the current directory)",
+    )
+    commands = parser.add_subparsers(dest="command", title="commands", metavar="{stats}")
+    stats_parser = commands.add_parser("stats", help="Print statistics for all tours under a directory and exit")
+    stats_parser.add_argument(
+        "root", nargs="?", default=".", help="Directory to search recursively (default: the workspace root)"
+    )
+    stats_parser.add_argument(
+        "--top", type=int, default=DEFAULT_TOP, help="Most referenced files and directories to list"
+    )
+    args = parser.parse_args()
+    set_validation_mode(args.validation)
+    try:
+        workspace.set_root(args.workspace_root)
+    except OSError as e:
+        parser.error(str(e))
+
+    if args.command == "stats":
+        print(json.dumps(tour_stats(workspace.resolve(args.root), args.top), separators=(",", ":")))
+        return
 
     async def run():
         async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
@@ -0,0 +1,151 @@
+"""Aggregate statistics across all tours under a directory."""
+
+import heapq
+import itertools
+import os
+import posixpath
+import statistics
+from bisect import bisect_right
+from collections import Counter
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any
+
+from .core import load_tour_uncached
+
+DEFAULT_TOP = 10
+DEFAULT_MAX_WORKERS = 8
+
+# Directories never searched for tours
+SKIPPED_DIRECTORIES = frozenset({".git", ".hg", ".svn", "node_modules", ".venv", "venv", "__pycache__"})
+
+# Upper bounds of the description length histogram buckets; the last bucket is open-ended
+DESCRIPTION_LENGTH_BUCKETS = (50, 200, 500, 1000)
+
+
+def iter_tours(root: str | Path) -> Iterator[Path]:
+    """Yield the .tour files under root as they are found, skipping VCS and dependency directories."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if name not in SKIPPED_DIRECTORIES]
+        for name in filenames:
+            if name.endswith(".tour"):
+                yield Path(dirpath, name)
+
+
+def find_tours(root: str | Path) -> list[Path]:
+    """Return all .tour files under root, skipping VCS and dependency directories."""
+    return sorted(iter_tours(root))
+
+
+def _load(path: Path) -> tuple[Path, dict[str, Any] | Exception]:
+    try:
+        return path, load_tour_uncached(str(path))
+    except Exception as e:
+        return path, e
+
+
+def _distribution(values: list[int]) -> dict[str, Any]:
+    if not values:
+        return {"min": 0, "max": 0, "mean": 0, "median": 0}
+    return {
+        "min": min(values),
+        "max": max(values),
+        "mean": round(statistics.fmean(values), 1),
+        "median": statistics.median(values),
+    }
+
+
+def _most_common(counter: Counter[str], top: int) -> list[tuple[str, int]]:
+    # Ties are broken by name, so the result does not depend on the order tours were loaded in
+    return heapq.nsmallest(top, counter.items(), key=lambda item: (-item[1], item[0]))
+
+
+def _bucket_labels() -> list[str]:
+    lower = 0
+    labels = []
+    for upper in DESCRIPTION_LENGTH_BUCKETS:
+        labels.append(f"{lower}-{upper - 1}")
+        lower = upper
+    labels.append(f"{lower}+")
+    return labels
+
+
+def tour_stats(
+    root: str | Path = ".", top: int = DEFAULT_TOP, max_workers: int = DEFAULT_MAX_WORKERS
+) -> dict[str, Any]:
+    """Compute aggregate statistics for every tour under root.
+
+    Tours are loaded in parallel as they are found and folded into the aggregates as each
+    load completes. At most max_workers * 2 loads are in flight at once, so each tour is read
+    once and dropped as soon as it has been counted; only the per-tour and per-step numbers
+    the aggregates need are kept. Loading bypasses the caches that editing relies on. Tours that fail validation,
+    including steps whose fields have the wrong type, are reported under "failed" rather
+    than counted.
+    """
+    root = Path(root)
+
+    steps_per_tour = []
+    empty_tours = []
+    failed = []
+    file_refs: Counter[str] = Counter()
+    directory_refs: Counter[str] = Counter()
+    description_lengths = []
+    labels = _bucket_labels()
+    histogram = dict.fromkeys(labels, 0)
+    missing_descriptions = 0
+
+    def count(path: Path, tour_data: dict[str, Any] | Exception) -> None:
+        nonlocal missing_descriptions
+        relative = path.relative_to(root).as_posix()
+        if isinstance(tour_data, Exception):
+            failed.append({"path": relative, "error": str(tour_data)})
+            return
+
+        steps = tour_data.get("steps", [])
+        steps_per_tour.append(len(steps))
+        if not steps:
+            empty_tours.append(relative)
+
+        for step in steps:
+            file = step.get("file")
+            if file:
+                file_refs[file] += 1
+            # A directory step references its directory; other steps, the one holding their file
+            directory = step.get("directory") or (file and (posixpath.dirname(file) or "."))
+            if directory:
+                directory_refs[directory] += 1
+
+            description = step.get("description")
+            if description is None:
+                missing_descriptions += 1
+                continue
+            length = len(description)
+            description_lengths.append(length)
+            histogram[labels[bisect_right(DESCRIPTION_LENGTH_BUCKETS, length)]] += 1
+
+    paths = iter_tours(root)
+    with ThreadPoolExecutor(max_workers) as pool:
+        pending = {pool.submit(_load, path) for path in itertools.islice(paths, max_workers * 2)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                count(*future.result())
+            # Keep the window full: one new load for each one counted
+            pending.update(pool.submit(_load, path) for path in itertools.islice(paths, len(done)))
+
+    empty_tours.sort()
+    failed.sort(key=lambda entry: entry["path"])
+    return {
+        "tours": len(steps_per_tour),
+        "failed": failed,
+        "steps": {"total": sum(steps_per_tour), **_distribution(steps_per_tour)},
+        "emptyTours": empty_tours,
+        "files": {"covered": len(file_refs), "top": _most_common(file_refs, top)},
+        "directories": {"covered": len(directory_refs), "top": _most_common(directory_refs, top)},
+        "descriptionLength": {
+            **_distribution(description_lengths),
+            "missing": missing_descriptions,
+            "histogram": histogram,
+        },
+    }
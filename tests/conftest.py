@@ -1,11 +1,17 @@
 """Pytest configuration and shared fixtures for BDD tests."""
 
+import asyncio
 import json
 import shutil
 from pathlib import Path
+from string import Template
 from typing import Any
 
 import pytest
+from pytest_bdd import parsers, then, when
+
+from codetour_mcp import core, server
+from codetour_mcp.schema import LENIENT
 
 
 @pytest.fixture
@@ -28,9 +34,24 @@ def tour_context():
         "step_list": None,
         "step_data": None,
         "last_result": None,
+        "last_error": None,
     }
 
 
+@pytest.fixture
+def server_workspace(tmp_path: Path, monkeypatch):
+    """Run server tools from tmp_path, with fresh per-process server state."""
+    monkeypatch.chdir(tmp_path)
+    server.histories.clear()
+    server.workspace.set_root(None)
+    server.workspace.clear()
+    yield tmp_path
+    server.histories.clear()
+    server.workspace.set_root(None)
+    server.workspace.clear()
+    core.set_validation_mode(LENIENT)
+
+
 def create_tour_file(path: str, title: str, description: str = "", steps: list[dict[str, Any]] | None = None):
     """Helper function to create a tour file."""
     tour_data = {"title": title, "steps": steps or []}
@@ -49,3 +70,57 @@ def load_tour_file(path: str) -> dict[str, Any]:
     """Helper function to load a tour file."""
     with open(path, encoding="utf-8") as f:
         return json.load(f)
+
+
+def call_tool(name: str, arguments: dict[str, Any]) -> str:
+    """Call a server tool and return the text of its result."""
+    return asyncio.run(server.call_tool(name, arguments))[0].text
+
+
+def tool_arguments(docstring: str, tour_context: dict[str, Any]) -> dict[str, Any]:
+    """Parse a step's JSON docstring.
+
+    $hash is replaced with the hash noted earlier and $root with the server's workspace root.
+    """
+    template = Template(docstring)
+    return json.loads(template.safe_substitute(hash=tour_context.get("hash", ""), root=server.workspace.root))
+
+
+# Steps shared by features that drive the server's tools
+@when(parsers.parse('I call the "{tool}" tool with:'))
+def call_tool_step(server_workspace, tour_context, tool, docstring):
+    """Call a tool; the call must succeed."""
+    tour_context["last_result"] = call_tool(tool, tool_arguments(docstring, tour_context))
+
+
+@when(parsers.parse('I try to call the "{tool}" tool with:'))
+def try_call_tool_step(server_workspace, tour_context, tool, docstring):
+    """Call a tool, keeping the error if it fails."""
+    tour_context["last_result"] = tour_context["last_error"] = None
+    try:
+        tour_context["last_result"] = call_tool(tool, tool_arguments(docstring, tour_context))
+    except Exception as e:
+        tour_context["last_error"] = e
+
+
+@then(parsers.parse('the tool result should contain "{text}"'))
+def tool_result_contains(tour_context, text):
+    """Verify the text of the last tool result."""
+    assert text in tour_context["last_result"]
+
+
+@then(parsers.parse('the tool call should fail with "{text}"'))
+def tool_call_fails(tour_context, text):
+    """Verify the last tool call failed with the given message."""
+    assert tour_context["last_error"] is not None
+    assert text in str(tour_context["last_error"])
+
+
+@then(
+    parsers.re(r"the listed history should have (?P<undo>\d+) undoable and (?P<redo>\d+) redoable edits?"),
+    converters={"undo": int, "redo": int},
+)
+def listed_history(tour_context, undo, redo):
+    """Verify the entries returned by the history tool."""
+    entries = json.loads(tour_context["last_result"])
+    assert (len(entries["undo"]), len(entries["redo"])) == (undo, redo)
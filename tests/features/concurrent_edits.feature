@@ -0,0 +1,97 @@
+Feature: Concurrent Edits
+  As a developer
+  I want edits based on an outdated version of a tour to be rejected or merged
+  So that concurrent editors do not silently overwrite each other
+
+  Background:
+    Given a tour directory ".tours"
+    And a tour at ".tours/shared.tour" with steps for "a.py,b.py"
+    And I note the hash of ".tours/shared.tour"
+
+  Scenario: An edit with the current hash is applied
+    When I call the "update_step" tool with:
+      """
+      {"tour_path": ".tours/shared.tour", "index": 0, "description": "Ours", "expected_hash": "$hash"}
+      """
+    Then the tool result should contain "Updated step at index 0"
+    And step 0 of ".tours/shared.tour" should have description "Ours"
+
+  Scenario: An edit based on an outdated version is rejected
+    When I call the "update_step" tool with:
+      """
+      {"tour_path": ".tours/shared.tour", "index": 0, "description": "Theirs"}
+      """
+    And I try to call the "update_step" tool with:
+      """
+      {"tour_path": ".tours/shared.tour", "index": 1, "description": "Ours", "expected_hash": "$hash"}
+      """
+    Then the tool call should fail with "has changed"
+    And step 1 of ".tours/shared.tour" should have description "About b.py"
+
+  Scenario: Independent edits are merged
+    When I call the "update_step" tool with:
+      """
+      {"tour_path": ".tours/shared.tour", "index": 0, "description": "Theirs"}
+      """
+    And I call the "update_step" tool with:
+      """
+      {"tour_path": ".tours/shared.tour", "index": 1, "description": "Ours", "expected_hash": "$hash", "on_conflict": "merge"}
+      """
+    Then the tool result should contain "merged with concurrent changes, 0 conflicts"
+    And step 0 of ".tours/shared.tour" should have description "Theirs"
+    And step 1 of ".tours/shared.tour" should have description "Ours"
+
+  Scenario: Conflicting edits are merged keeping this edit
+    When I call the "update_step" tool with:
+      """
+      {"tour_path": ".tours/shared.tour", "index": 0, "description": "Theirs"}
+      """
+    And I call the "update_step" tool with:
+      """
+      {"tour_path": ".tours/shared.tour", "index": 0, "description": "Ours", "expected_hash": "$hash", "on_conflict": "merge"}
+      """
+    Then the tool result should contain "merged with concurrent changes, 1 conflict"
+    And step 0 of ".tours/shared.tour" should have description "Ours"
+
+  Scenario: An edit based on a forgotten version cannot be merged
+    Given the server only remembers the latest version of each tour
+    When I call the "update_step" tool with:
+      """
+      {"tour_path": ".tours/shared.tour", "index": 0, "description": "Theirs"}
+      """
+    And I try to call the "update_step" tool with:
+      """
+      {"tour_path": ".tours/shared.tour", "index": 1, "description": "Ours", "expected_hash": "$hash", "on_conflict": "merge"}
+      """
+    Then the tool call should fail with "the expected version is not known"
+    And step 1 of ".tours/shared.tour" should have description "About b.py"
+
+  Scenario: A write by another process while saving is not overwritten
+    Given another process rewrites ".tours/shared.tour" while it is being saved
+    When I try to call the "update_step" tool with:
+      """
+      {"tour_path": ".tours/shared.tour", "index": 0, "description": "Ours"}
+      """
+    Then the tool call should fail with "changed by another writer"
+    And ".tours/shared.tour" should hold the other process's version
+    And no temporary files should be left in ".tours"
+
+  Scenario: A write by another process after the tour is loaded is not overwritten
+    Given another process changes step 0 of ".tours/shared.tour" to "Theirs" after it is loaded for editing
+    When I try to call the "update_step" tool with:
+      """
+      {"tour_path": ".tours/shared.tour", "index": 1, "description": "Ours", "expected_hash": "$hash"}
+      """
+    Then the tool call should fail with "changed by another writer"
+    And step 0 of ".tours/shared.tour" should have description "Theirs"
+    And step 1 of ".tours/shared.tour" should have description "About b.py"
+
+  Scenario: A write by another process after the tour is loaded is merged
+    Given another process changes step 0 of ".tours/shared.tour" to "Theirs" after it is loaded for editing
+    When I call the "update_step" tool with:
+      """
+      {"tour_path": ".tours/shared.tour", "index": 1, "description": "Ours", "expected_hash": "$hash", "on_conflict": "merge"}
+      """
+    Then the tool result should contain "merged with concurrent changes, 0 conflicts"
+    And step 0 of ".tours/shared.tour" should have description "Theirs"
+    And step 1 of ".tours/shared.tour" should have description "Ours"
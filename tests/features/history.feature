@@ -0,0 +1,168 @@
+Feature: Edit History
+  As a developer
+  I want to undo and redo edits to a tour
+  So that I can recover from bad changes
+
+  Background:
+    Given a tour directory ".tours"
+    And the tour at ".tours/history-tour.tour" has steps:
+      | file        | step1.py | step2.py |
+      | description | Step 1   | Step 2   |
+
+  Scenario: Undo an inserted step
+    When I insert a step with file "middle.py" at index 1 into ".tours/history-tour.tour"
+    And I undo the last edit to ".tours/history-tour.tour"
+    Then the tour should have 2 steps
+    And step 1 should have file "step2.py"
+
+  Scenario: Redo an undone step insertion
+    When I insert a step with file "middle.py" at index 1 into ".tours/history-tour.tour"
+    And I undo the last edit to ".tours/history-tour.tour"
+    And I redo the last edit to ".tours/history-tour.tour"
+    Then the tour should have 3 steps
+    And step 1 should have file "middle.py"
+
+  Scenario: Undo a removed step
+    When I remove step 0 from ".tours/history-tour.tour" with history
+    And I undo the last edit to ".tours/history-tour.tour"
+    Then the tour should have 2 steps
+    And step 0 should have file "step1.py"
+
+  Scenario: Undo a title update removes the added title
+    When I set the title of step 0 in ".tours/history-tour.tour" to "Intro"
+    And I undo the last edit to ".tours/history-tour.tour"
+    Then step 0 should have no title
+
+  Scenario: Undo after an outside edit clears the history
+    When I insert a step with file "middle.py" at index 1 into ".tours/history-tour.tour"
+    And the tour at ".tours/history-tour.tour" is edited outside the history
+    Then undoing the last edit to ".tours/history-tour.tour" should fail
+    And the history should be empty
+
+  Scenario: History keeps only the most recent entries
+    Given a history limited to 2 entries
+    When I insert a step with file "a.py" at index 0 into ".tours/history-tour.tour"
+    And I insert a step with file "b.py" at index 0 into ".tours/history-tour.tour"
+    And I insert a step with file "c.py" at index 0 into ".tours/history-tour.tour"
+    Then the history should have 2 undoable entries
+
+  Scenario Outline: An out-of-range insert through the tools is recorded where it landed
+    When I call the "insert_step" tool with:
+      """
+      {"tour_path": ".tours/history-tour.tour", "file": "new.py", "pattern_regex": "^x", "description": "New", "index": <index>}
+      """
+    Then the tool result should contain "Inserted step at index <actual>"
+    When I call the "undo" tool with:
+      """
+      {"tour_path": ".tours/history-tour.tour"}
+      """
+    Then the tool result should contain "Undid insert_step at index <actual>"
+    And the tour should have 2 steps
+    And step 0 should have file "step1.py"
+
+    Examples:
+      | index | actual |
+      | 100   | 2      |
+      | -1    | 0      |
+
+  Scenario: Undo, redo and history through the tools
+    When I call the "insert_step" tool with:
+      """
+      {"tour_path": ".tours/history-tour.tour", "file": "middle.py", "pattern_regex": "^x", "description": "Middle", "index": 1}
+      """
+    And I call the "undo" tool with:
+      """
+      {"tour_path": ".tours/history-tour.tour"}
+      """
+    And I call the "history" tool with:
+      """
+      {"tour_path": ".tours/history-tour.tour"}
+      """
+    Then the listed history should have 0 undoable and 1 redoable edits
+    When I call the "redo" tool with:
+      """
+      {"tour_path": ".tours/history-tour.tour"}
+      """
+    Then the tool result should contain "Redid insert_step at index 1"
+    And the tour should have 3 steps
+    And step 1 should have file "middle.py"
+
+  Scenario: A failed save leaves the history unchanged
+    When I call the "insert_step" tool with:
+      """
+      {"tour_path": ".tours/history-tour.tour", "file": "middle.py", "pattern_regex": "^x", "description": "Middle", "index": 1}
+      """
+    And saving tours fails
+    And I try to call the "undo" tool with:
+      """
+      {"tour_path": ".tours/history-tour.tour"}
+      """
+    Then the tool call should fail with "No space left on device"
+    And the tour should have 3 steps
+    When I call the "history" tool with:
+      """
+      {"tour_path": ".tours/history-tour.tour"}
+      """
+    Then the listed history should have 1 undoable and 0 redoable edits
+
+  Scenario Outline: A tour file that cannot be read is rebuilt by create_tour
+    Given the file ".tours/broken.tour" contains:
+      """
+      <content>
+      """
+    When I call the "create_tour" tool with:
+      """
+      {"path": ".tours/broken.tour", "title": "Rebuilt"}
+      """
+    Then the tool result should contain "Created tour 'Rebuilt'"
+    And the tour at ".tours/broken.tour" should have title "Rebuilt"
+    When I call the "undo" tool with:
+      """
+      {"tour_path": ".tours/broken.tour"}
+      """
+    Then the tool result should contain "Undid replace_tour"
+    And ".tours/broken.tour" should not exist
+
+    Examples:
+      | content           |
+      | {"title": "Half   |
+      | [1, 2]            |
+
+  Scenario: Looking at history does not keep a log for the tour
+    When I call the "history" tool with:
+      """
+      {"tour_path": ".tours/never-edited.tour"}
+      """
+    Then the listed history should have 0 undoable and 0 redoable edits
+    When I try to call the "undo" tool with:
+      """
+      {"tour_path": ".tours/history-tour.tour"}
+      """
+    Then the tool call should fail with "Nothing to undo"
+    And the server should keep history for 0 tours
+
+  Scenario: Only the most recently edited tours keep their history
+    Given the server keeps history for at most 2 tours
+    When I call the "create_tour" tool with:
+      """
+      {"path": ".tours/first.tour", "title": "First"}
+      """
+    And I call the "create_tour" tool with:
+      """
+      {"path": ".tours/second.tour", "title": "Second"}
+      """
+    And I call the "create_tour" tool with:
+      """
+      {"path": ".tours/third.tour", "title": "Third"}
+      """
+    Then the server should keep history for 2 tours
+    When I try to call the "undo" tool with:
+      """
+      {"tour_path": ".tours/first.tour"}
+      """
+    Then the tool call should fail with "Nothing to undo"
+    When I call the "undo" tool with:
+      """
+      {"tour_path": ".tours/third.tour"}
+      """
+    Then the tool result should contain "Undid replace_tour"
@@ -0,0 +1,69 @@
+Feature: Tour Diff and Merge
+  As a developer
+  I want to compare and merge versions of a tour edited concurrently
+  So that one editor's changes do not silently overwrite another's
+
+  Background:
+    Given a base tour with steps:
+      | file | description |
+      | a.py | Step A      |
+      | b.py | Step B      |
+      | c.py | Step C      |
+
+  Scenario: Inserting a step is not reported as changing later steps
+    Given our version inserts "z.py" at index 0
+    When I diff the base tour against our version
+    Then the diff should report 1 added, 0 removed, 0 modified and 0 moved steps
+
+  Scenario: Diff reports modified and moved steps
+    Given our version changes the description of "b.py" to "New B"
+    And our version moves "a.py" to the end
+    When I diff the base tour against our version
+    Then the diff should report 0 added, 0 removed, 1 modified and 1 moved steps
+    And the modified step should be "b.py"
+    And the moved step should be "a.py"
+
+  Scenario: Independent changes are combined
+    Given our version inserts "z.py" at index 0
+    And their version changes the description of "c.py" to "New C"
+    And their version inserts "d.py" at index 2
+    When I merge our version and their version
+    Then the merged tour should have files "z.py,a.py,b.py,d.py,c.py"
+    And the merged step "c.py" should have description "New C"
+    And there should be 0 conflicts
+
+  Scenario: A deletion on one side is applied
+    Given their version removes "b.py"
+    When I merge our version and their version
+    Then the merged tour should have files "a.py,c.py"
+    And there should be 0 conflicts
+
+  Scenario: Conflicting edits keep our version
+    Given our version changes the description of "a.py" to "Ours"
+    And their version changes the description of "a.py" to "Theirs"
+    When I merge our version and their version
+    Then the merged step "a.py" should have description "Ours"
+    And there should be 1 conflict
+
+  Scenario: A step modified on one side and deleted on the other is kept
+    Given our version removes "b.py"
+    And their version changes the description of "b.py" to "Theirs"
+    When I merge our version and their version
+    Then the merged tour should have files "a.py,b.py,c.py"
+    And there should be 1 conflict
+
+  Scenario: Steps pointing at malformed locations can still be diffed and merged
+    Given our version inserts at index 0 the step:
+      """
+      {"file": "u.py", "uri": ["https://example.com"], "line": {"at": 1}, "description": "Ours"}
+      """
+    And their version inserts at index 0 the step:
+      """
+      {"file": "u.py", "uri": ["https://example.com"], "line": {"at": 1}, "description": "Theirs"}
+      """
+    When I diff the base tour against our version
+    Then the diff should report 1 added, 0 removed, 0 modified and 0 moved steps
+    When I merge our version and their version
+    Then the merged tour should have files "u.py,a.py,b.py,c.py"
+    And the merged step "u.py" should have description "Ours"
+    And there should be 1 conflict
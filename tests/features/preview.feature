@@ -0,0 +1,114 @@
+Feature: Step Previews
+  As a developer
+  I want to see the code each step points at
+  So that I do not have to read files and resolve patterns myself
+
+  Background:
+    Given a source file "src/main.py" with content:
+      """
+      import sys
+
+
+      def helper():
+          return 1
+
+
+      def main():
+          helper()
+          sys.exit(0)
+      """
+
+  Scenario: Preview a pattern step
+    Given a tour with steps:
+      | file        | pattern      |
+      | src/main.py | ^def main    |
+    When I preview the steps with 1 line of context
+    Then preview 0 should point at line 8
+    And preview 0 should show lines 7 to 9
+
+  Scenario: Preview a line step
+    Given a tour with steps:
+      | file        | line |
+      | src/main.py | 1    |
+    When I preview the steps with 1 line of context
+    Then preview 0 should point at line 1
+    And preview 0 should show lines 1 to 2
+
+  Scenario: Report steps that cannot be resolved
+    Given a tour with steps:
+      | file        | pattern        |
+      | src/main.py | def missing    |
+      | src/gone.py | def main       |
+    When I preview the steps with 1 line of context
+    Then preview 0 should have error "Pattern not found"
+    And preview 1 should have error "File not found"
+
+  Scenario: Each file is read once per request
+    Given a tour with steps:
+      | file        | pattern      |
+      | src/main.py | ^def main    |
+      | src/main.py | def helper   |
+      | src/main.py | import sys   |
+    When I preview the steps with 1 line of context
+    Then I should get 3 previews
+    And the file cache should have read 1 file
+
+  Scenario: Previews stop at the size limit
+    Given a tour with steps:
+      | file        | pattern      |
+      | src/main.py | ^def main    |
+      | src/main.py | def helper   |
+      | src/main.py | import sys   |
+    When I preview the steps with a limit of 100 bytes
+    Then I should get 1 preview
+    And the previews should be truncated at step 1
+
+  Scenario: A first preview larger than the size limit is clipped to fit
+    Given a source file "dist/app.min.js" with one line of 1000000 characters
+    And a tour with steps:
+      | file            | line |
+      | dist/app.min.js | 1    |
+      | src/main.py     | 1    |
+    When I preview the steps with a limit of 1000 bytes
+    Then I should get 1 preview
+    And preview 0 should be clipped
+    And the previews should fit in 1000 bytes
+    And the previews should be truncated at step 1
+
+  Scenario: A first preview with a long file name is clipped to fit
+    Given a tour with a step for a missing file whose path is 3000 characters long
+    When I preview the steps with a limit of 1000 bytes
+    Then I should get 1 preview
+    And preview 0 should be clipped
+    And the previews should fit in 1000 bytes
+
+  Scenario: Long lines are cut short
+    Given a source file "dist/app.min.js" with one line of 5000 characters
+    And a tour with steps:
+      | file            | line |
+      | dist/app.min.js | 1    |
+    When I preview the steps with 1 line of context
+    Then preview 0 should be clipped
+    And preview 0 should have no line longer than 1003 characters
+
+  Scenario: Steps with an invalid file are reported
+    Given a tour with a step:
+      """
+      {"file": ["src/main.py"], "description": "Not a path"}
+      """
+    When I preview the steps with 1 line of context
+    Then preview 0 should have error "Invalid file: expected a string"
+
+  Scenario Outline: Steps with a line that is not a finite number are reported
+    Given a tour with a step:
+      """
+      {"file": "src/main.py", "line": <line>, "description": "Nowhere"}
+      """
+    When I preview the steps with 1 line of context
+    Then preview 0 should have error "Invalid line: <shown>"
+
+    Examples:
+      | line      | shown |
+      | Infinity  | inf   |
+      | -Infinity | -inf  |
+      | NaN       | nan   |
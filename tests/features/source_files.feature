@@ -0,0 +1,68 @@
+Feature: Source File Access
+  As a developer
+  I want source files referenced by tours to be read off the event loop and cached
+  So that previews and existence checks across many steps stay fast
+
+  Background:
+    Given a source file "src/app.py" with 10 numbered lines
+
+  Scenario: Read a window of lines
+    When I read lines 2 to 5 of "src/app.py"
+    Then I should get lines "line 3,line 4,line 5"
+
+  Scenario: An unchanged file is read only once
+    When I read lines 0 to 1 of "src/app.py"
+    And I read lines 5 to 6 of "src/app.py"
+    Then the file cache should have 1 miss and 1 hit
+
+  Scenario: A modified file is read again
+    When I read lines 0 to 1 of "src/app.py"
+    And the source file "src/app.py" is rewritten with 3 numbered lines
+    And I read lines 0 to 10 of "src/app.py"
+    Then I should get lines "line 1,line 2,line 3"
+    And the file cache should have 2 misses and 0 hits
+
+  Scenario: Large files are mapped instead of read into memory
+    Given files of 64 bytes or more are mapped
+    When I read lines 8 to 10 of "src/app.py"
+    Then I should get lines "line 9,line 10"
+    And "src/app.py" should be mapped
+
+  Scenario Outline: Find the line matching a pattern
+    Given files of <threshold> bytes or more are mapped
+    When I search "src/app.py" for "^line 7$"
+    Then the match should be on line 6
+
+    Examples:
+      | threshold |
+      | 64        |
+      | 4096      |
+
+  Scenario Outline: Find a pattern after multi-byte characters
+    Given a source file "src/unicode.py" with content:
+      """
+      # café, naïve, 日本語
+      # ünïcödé
+      target = "ß"
+      """
+    And files of <threshold> bytes or more are mapped
+    When I search "src/unicode.py" for "^target"
+    Then the match should be on line 2
+
+    Examples:
+      | threshold |
+      | 16        |
+      | 4096      |
+
+  Scenario: Missing files are reported as absent
+    When I read lines 0 to 1 of "src/missing.py"
+    Then I should get no lines
+    And "src/missing.py" should not exist
+
+  Scenario: The cache stays within its size budget
+    Given a source file "src/other.py" with 10 numbered lines
+    And a file cache limited to 200 bytes
+    When I read lines 0 to 1 of "src/app.py"
+    And I read lines 0 to 1 of "src/other.py"
+    And I read lines 0 to 1 of "src/app.py"
+    Then the file cache should have 3 misses and 0 hits
@@ -0,0 +1,63 @@
+Feature: Tour Statistics
+  As a developer
+  I want aggregate numbers across all tours in a repository
+  So that I do not have to read every tour myself
+
+  Background:
+    Given a tour directory ".tours"
+    And a tour at ".tours/one.tour" with steps:
+      | file        | directory | description                                                     |
+      | src/main.py |           | Short                                                           |
+      | src/util.py |           | A description that is long enough to land in the second bucket  |
+    And a tour at "docs/.tours/two.tour" with steps:
+      | file        | directory | description |
+      | src/main.py |           | Again       |
+      | README.md   | docs      | Docs        |
+    And a tour at ".tours/empty.tour" with no steps
+
+  Scenario: Count tours and steps
+    When I compute tour statistics
+    Then there should be 3 tours with 4 steps in total
+    And the empty tours should be ".tours/empty.tour"
+
+  Scenario: Count referenced files and directories
+    When I compute tour statistics
+    Then 3 files should be covered
+    And the most referenced file should be "src/main.py" with 2 references
+    And the most referenced directory should be "src" with 3 references
+
+  Scenario: Describe description lengths
+    When I compute tour statistics
+    Then the description length histogram should have 3 in "0-49" and 1 in "50-199"
+
+  Scenario: Tours that cannot be loaded are reported
+    Given a file at ".tours/broken.tour" containing "{not json"
+    When I compute tour statistics
+    Then there should be 3 tours with 4 steps in total
+    And ".tours/broken.tour" should be reported as failed
+
+  Scenario: Dependency directories are not searched
+    Given a tour at "node_modules/pkg/.tours/vendored.tour" with no steps
+    When I compute tour statistics
+    Then there should be 3 tours with 4 steps in total
+
+  Scenario: Tours with step values of the wrong type are reported
+    Given a file at ".tours/odd.tour" containing:
+      """
+      {"title": "Odd", "steps": [{"file": ["q.py"], "description": 5}, {"file": "q.py", "directory": 7}]}
+      """
+    When I compute tour statistics
+    Then there should be 3 tours with 4 steps in total
+    And 3 files should be covered
+    And ".tours/odd.tour" should be reported as failed
+
+  Scenario: Computing statistics leaves the edit caches alone
+    When I compute tour statistics
+    Then no tour under the workspace should be in the edit caches
+
+  Scenario: Only a few tours are held at once
+    Given 40 more tours at ".tours/bulk" with no steps
+    And loads are tracked
+    When I compute tour statistics with 2 workers
+    Then there should be 43 tours with 4 steps in total
+    And at most 4 tours should have been held at once
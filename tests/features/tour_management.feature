@@ -30,3 +30,23 @@ Feature: Tour Management
     Then I should get 2 tours
     And the tour list should contain ".tours/tour1.tour"
     And the tour list should contain ".tours/tour2.tour"
+
+  Scenario: Saving an unchanged tour leaves the file untouched
+    Given a tour directory ".tours"
+    And a tour file exists at ".tours/same-tour.tour" with title "Same Tour"
+    When I save the tour at ".tours/same-tour.tour" with title "Same Tour"
+    Then the tour file should not have been rewritten
+
+  Scenario: Saving a changed tour rewrites the file
+    Given a tour directory ".tours"
+    And a tour file exists at ".tours/changed-tour.tour" with title "Old Title"
+    When I save the tour at ".tours/changed-tour.tour" with title "New Title"
+    Then the tour file should have been rewritten
+    And the tour should have title "New Title"
+
+  Scenario: A write while a tour is being read is not hidden by the hash cache
+    Given a tour directory ".tours"
+    And a tour file exists at ".tours/racy-tour.tour" with title "Old Title"
+    And another process retitles it "A Much Longer Title" while it is being read
+    When I read the tour at ".tours/racy-tour.tour"
+    Then the hash of ".tours/racy-tour.tour" should match its content
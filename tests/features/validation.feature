@@ -0,0 +1,97 @@
+Feature: Schema Validation
+  As a developer
+  I want tours checked against the CodeTour schema when they are loaded and saved
+  So that malformed tours are reported clearly instead of failing deep inside tools
+
+  Background:
+    Given a tour directory ".tours"
+
+  Scenario: A conforming tour passes strict validation
+    Given a tour file ".tours/valid.tour" containing:
+      """
+      {"title": "Valid", "isPrimary": true, "steps": [
+        {"file": "a.py", "line": 3, "description": "A line step"},
+        {"file": "b.py", "pattern": "def b", "title": "B", "description": "A pattern step"},
+        {"file": "c.py", "description": "A selection",
+         "selection": {"start": {"line": 1, "character": 1}, "end": {"line": 2, "character": 4}},
+         "commands": ["editor.action.formatDocument"]}
+      ]}
+      """
+    When I load ".tours/valid.tour" with strict validation
+    Then the tour should load
+
+  Scenario: A tour that is not an object is rejected in either mode
+    Given a tour file ".tours/list.tour" containing:
+      """
+      [{"title": "Not a tour"}]
+      """
+    When I load ".tours/list.tour" with lenient validation
+    Then loading should fail with "tour: expected object"
+
+  Scenario: A step without a description is rejected in strict mode
+    Given a tour file ".tours/missing.tour" containing:
+      """
+      {"title": "Missing", "steps": [{"file": "a.py", "description": "ok"}, {"file": "b.py"}]}
+      """
+    When I load ".tours/missing.tour" with strict validation
+    Then loading should fail with "steps[1].description: required"
+
+  Scenario: A step without a description is accepted in lenient mode
+    Given a tour file ".tours/missing.tour" containing:
+      """
+      {"title": "Missing", "steps": [{"file": "b.py"}]}
+      """
+    When I load ".tours/missing.tour" with lenient validation
+    Then the tour should load
+
+  Scenario Outline: Step fields the tools read are type-checked in lenient mode
+    Given a tour file ".tours/odd.tour" containing:
+      """
+      {"title": "Odd", "steps": [<step>]}
+      """
+    When I load ".tours/odd.tour" with lenient validation
+    Then loading should fail with "<error>"
+
+    Examples:
+      | step                                               | error                                 |
+      | {"file": ["a.py"], "description": "d"}             | steps[0].file: expected string        |
+      | {"file": "a.py", "description": 5}                 | steps[0].description: expected string |
+      | {"directory": {"path": "src"}, "description": "d"} | steps[0].directory: expected string   |
+      | {"file": "a.py", "line": Infinity}                 | steps[0].line: expected finite number |
+
+  Scenario: Tools report a tour they cannot work with as invalid
+    Given a tour file ".tours/odd.tour" containing:
+      """
+      {"title": "Odd", "steps": [{"file": "a.py", "description": 5}]}
+      """
+    When I try to call the "list_steps" tool with:
+      """
+      {"tour_path": ".tours/odd.tour"}
+      """
+    Then the tool call should fail with "steps[0].description: expected string"
+
+  Scenario: Field types are checked in strict mode
+    Given a tour file ".tours/types.tour" containing:
+      """
+      {"title": "Types", "steps": [{"file": "a.py", "line": "3", "description": "d"},
+                                   {"file": "b.py", "line": true, "description": "d"},
+                                   {"file": "c.py", "description": "d", "selection": {"start": {"line": 1}}}]}
+      """
+    When I load ".tours/types.tour" with strict validation
+    Then loading should fail with "steps[0].line: expected number"
+    And loading should fail with "steps[1].line: expected number"
+    And loading should fail with "steps[2].selection.start.character: expected number"
+
+  Scenario: An invalid tour is not saved
+    When I save a tour without a title to ".tours/untitled.tour" with strict validation
+    Then saving should fail with "title: required"
+    And no tour file should exist at ".tours/untitled.tour"
+
+  Scenario: An edit that breaks the step it changed is not saved
+    Given a tour file ".tours/edited.tour" containing:
+      """
+      {"title": "Edited", "steps": [{"file": "a.py", "description": "A"}, {"file": "b.py", "description": "B"}]}
+      """
+    When I load ".tours/edited.tour" with strict validation
+    And I save ".tours/edited.tour" with step 1 given a numeric description, with strict validation
+    Then saving should fail with "steps[1].description: expected string"
@@ -0,0 +1,90 @@
+Feature: Workspace Paths
+  As a developer
+  I want every spelling of a tour path to identify the same tour
+  So that per-tour state is shared and paths are not resolved on every call
+
+  Background:
+    Given a workspace with a tour at ".tours/a.tour"
+
+  Scenario: Different spellings resolve to the same tour
+    When I resolve ".tours/a.tour"
+    And I resolve "./.tours/a.tour"
+    And I resolve "src/../.tours/a.tour"
+    And I resolve the absolute path of ".tours/a.tour"
+    Then every path should resolve to ".tours/a.tour" in the workspace
+
+  Scenario: Paths through a symlinked directory resolve to their target
+    Given a symlink "linked" to ".tours"
+    When I resolve "linked/a.tour"
+    Then every path should resolve to ".tours/a.tour" in the workspace
+
+  Scenario: Relative paths are taken from the workspace root, not the current directory
+    Given the current directory is somewhere else
+    When I resolve ".tours/a.tour"
+    Then every path should resolve to ".tours/a.tour" in the workspace
+
+  Scenario: Resolved paths are memoised
+    When I resolve ".tours/a.tour"
+    And I resolve ".tours/a.tour"
+    And I resolve ".tours/a.tour"
+    Then the resolver should have 1 miss and 2 hits
+
+  Scenario: Missing paths are resolved again once they exist
+    When I resolve ".tours/b.tour"
+    And a symlink ".tours/b.tour" to ".tours/a.tour" is created
+    And I resolve ".tours/b.tour"
+    Then the last path should resolve to ".tours/a.tour" in the workspace
+
+  Scenario: Paths are shown relative to the workspace root
+    When I resolve "./.tours/a.tour"
+    Then the last path should be shown as ".tours/a.tour"
+
+  Scenario: Edits through different spellings of a tour share its history
+    Given the server runs from the workspace
+    When I call the "insert_step" tool with:
+      """
+      {"tour_path": "./.tours/a.tour", "file": "src/app.py", "pattern_regex": "^def main", "description": "Main"}
+      """
+    And I call the "update_step" tool with:
+      """
+      {"tour_path": "$root/.tours/a.tour", "index": 0, "description": "Entry point"}
+      """
+    And I call the "undo" tool with:
+      """
+      {"tour_path": ".tours/a.tour"}
+      """
+    Then the tool result should contain "Undid update_step at index 0"
+    When I call the "history" tool with:
+      """
+      {"tour_path": "$root/src/../.tours/a.tour"}
+      """
+    Then the listed history should have 1 undoable and 1 redoable edit
+
+  Scenario: A hash read through one spelling is accepted through another
+    Given the server runs from the workspace
+    And I note the hash of "./.tours/a.tour" through the tools
+    When I call the "insert_step_by_directory" tool with:
+      """
+      {"tour_path": "$root/.tours/a.tour", "file": "src/app.py", "directory": "src", "description": "Sources", "expected_hash": "$hash"}
+      """
+    Then the tool result should contain "Inserted step at index 0"
+
+  Scenario: Tools resolve paths against the configured workspace root
+    Given the workspace has a file "src/app.py" containing "def main():"
+    And the server's workspace root is the workspace
+    And the current directory is somewhere else
+    When I call the "insert_step" tool with:
+      """
+      {"tour_path": ".tours/a.tour", "file": "src/app.py", "pattern_regex": "^def main", "description": "Main"}
+      """
+    And I call the "preview_steps" tool with:
+      """
+      {"tour_path": ".tours/a.tour"}
+      """
+    Then the tool result should contain "def main():"
+    And the tour at ".tours/a.tour" in the workspace should have 1 step
+
+  Scenario: The workspace root can be set on the command line
+    Given the current directory is somewhere else
+    When I run the "stats" command with the workspace root set to the workspace
+    Then the printed statistics should count 1 tour
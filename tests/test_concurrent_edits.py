@@ -0,0 +1,141 @@
+"""BDD step definitions for concurrent edits through the server's tools."""
+
+import json
+from collections import OrderedDict
+
+from conftest import call_tool, create_tour_file, load_tour_file
+from pytest_bdd import given, parsers, scenario, then
+
+from codetour_mcp import core, server
+
+
+# Scenarios
+@scenario("features/concurrent_edits.feature", "An edit with the current hash is applied")
+def test_an_edit_with_the_current_hash_is_applied():
+    """Test an edit whose expected hash matches."""
+    pass
+
+
+@scenario("features/concurrent_edits.feature", "An edit based on an outdated version is rejected")
+def test_an_edit_based_on_an_outdated_version_is_rejected():
+    """Test rejecting an edit whose expected hash no longer matches."""
+    pass
+
+
+@scenario("features/concurrent_edits.feature", "Independent edits are merged")
+def test_independent_edits_are_merged():
+    """Test merging an outdated edit without conflicts."""
+    pass
+
+
+@scenario("features/concurrent_edits.feature", "Conflicting edits are merged keeping this edit")
+def test_conflicting_edits_are_merged_keeping_this_edit():
+    """Test merging an outdated edit that conflicts."""
+    pass
+
+
+@scenario("features/concurrent_edits.feature", "An edit based on a forgotten version cannot be merged")
+def test_an_edit_based_on_a_forgotten_version_cannot_be_merged():
+    """Test merging when the expected version is no longer known."""
+    pass
+
+
+@scenario("features/concurrent_edits.feature", "A write by another process while saving is not overwritten")
+def test_a_write_by_another_process_while_saving_is_not_overwritten():
+    """Test that saving rechecks the file before replacing it."""
+    pass
+
+
+@scenario("features/concurrent_edits.feature", "A write by another process after the tour is loaded is not overwritten")
+def test_a_write_by_another_process_after_the_tour_is_loaded_is_not_overwritten():
+    """Test that saving checks the file against the version the edit was based on."""
+    pass
+
+
+@scenario("features/concurrent_edits.feature", "A write by another process after the tour is loaded is merged")
+def test_a_write_by_another_process_after_the_tour_is_loaded_is_merged():
+    """Test merging an edit into a write that landed after the tour was loaded."""
+    pass
+
+
+OTHER_PROCESS_TOUR = {"title": "Written elsewhere", "steps": []}
+
+
+# Given steps
+@given(parsers.parse('a tour directory "{tour_dir}"'), target_fixture="tour_directory")
+def tour_directory(temp_tour_dir, tour_dir):
+    """Create a tour directory."""
+    return temp_tour_dir
+
+
+@given(parsers.parse('a tour at "{path}" with steps for "{files}"'))
+def tour_with_steps(tour_directory, path, files):
+    """Create a tour with one step per file."""
+    steps = [{"file": file, "description": f"About {file}"} for file in files.split(",")]
+    create_tour_file(str(tour_directory.parent / path), "Shared Tour", steps=steps)
+
+
+@given(parsers.parse('I note the hash of "{path}"'))
+def note_hash(server_workspace, tour_context, path):
+    """Read the tour's hash as a client would before editing."""
+    tour_context["hash"] = json.loads(call_tool("read_tour", {"path": path, "with_hash": True}))["hash"]
+
+
+@given("the server only remembers the latest version of each tour")
+def remember_latest_only(monkeypatch):
+    """Start an empty store of recent tour versions that only has room for one."""
+    monkeypatch.setattr(core, "_recent_versions", OrderedDict())
+    monkeypatch.setattr(core, "_recent_versions_bytes", 0)
+    monkeypatch.setattr(core, "_MAX_RECENT_VERSIONS_BYTES", 1)
+
+
+@given(parsers.parse('another process rewrites "{path}" while it is being saved'))
+def concurrent_writer(tour_directory, monkeypatch, path):
+    """Rewrite the tour from outside the server just after a save has started writing."""
+    mkstemp = core.tempfile.mkstemp
+
+    def write_then_mkstemp(*args, **kwargs):
+        create_tour_file(str(tour_directory.parent / path), OTHER_PROCESS_TOUR["title"])
+        return mkstemp(*args, **kwargs)
+
+    monkeypatch.setattr(core.tempfile, "mkstemp", write_then_mkstemp)
+
+
+@given(
+    parsers.parse(
+        'another process changes step {index:d} of "{path}" to "{description}" after it is loaded for editing'
+    )
+)
+def write_after_load(tour_directory, monkeypatch, index, path, description):
+    """Change the tour from outside the server between loading it for an edit and saving it."""
+    load_for_edit = server.load_for_edit
+
+    def load_then_write(*args, **kwargs):
+        loaded = load_for_edit(*args, **kwargs)
+        full_path = str(tour_directory.parent / path)
+        tour_data = load_tour_file(full_path)
+        tour_data["steps"][index]["description"] = description
+        with open(full_path, "w", encoding="utf-8") as f:
+            json.dump(tour_data, f)
+        return loaded
+
+    monkeypatch.setattr(server, "load_for_edit", load_then_write)
+
+
+# Then steps
+@then(parsers.parse('step {index:d} of "{path}" should have description "{description}"'))
+def step_description(tour_directory, index, path, description):
+    """Verify a step's description on disk."""
+    assert load_tour_file(str(tour_directory.parent / path))["steps"][index]["description"] == description
+
+
+@then(parsers.parse('"{path}" should hold the other process\'s version'))
+def holds_other_version(tour_directory, path):
+    """Verify the other process's write survived."""
+    assert load_tour_file(str(tour_directory.parent / path)) == OTHER_PROCESS_TOUR
+
+
+@then(parsers.parse('no temporary files should be left in "{directory}"'))
+def no_temporary_files(tour_directory, directory):
+    """Verify a failed save cleaned up after itself."""
+    assert [p.name for p in (tour_directory.parent / directory).iterdir()] == ["shared.tour"]
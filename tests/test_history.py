@@ -0,0 +1,260 @@
+"""BDD step definitions for edit history."""
+
+import pytest
+from pytest_bdd import given, parsers, scenario, then, when
+
+from codetour_mcp import server
+from codetour_mcp.core import load_tour, save_tour
+from codetour_mcp.history import (
+    TourHistories,
+    TourHistory,
+    insert_step_delta,
+    remove_step_delta,
+    update_step_delta,
+)
+
+
+# Scenarios
+@scenario("features/history.feature", "Undo an inserted step")
+def test_undo_an_inserted_step():
+    """Test undoing an inserted step."""
+    pass
+
+
+@scenario("features/history.feature", "Redo an undone step insertion")
+def test_redo_an_undone_step_insertion():
+    """Test redoing an undone step insertion."""
+    pass
+
+
+@scenario("features/history.feature", "Undo a removed step")
+def test_undo_a_removed_step():
+    """Test undoing a removed step."""
+    pass
+
+
+@scenario("features/history.feature", "Undo a title update removes the added title")
+def test_undo_a_title_update_removes_the_added_title():
+    """Test undoing a title update."""
+    pass
+
+
+@scenario("features/history.feature", "Undo after an outside edit clears the history")
+def test_undo_after_an_outside_edit_clears_the_history():
+    """Test undoing after the tour was edited outside the history."""
+    pass
+
+
+@scenario("features/history.feature", "History keeps only the most recent entries")
+def test_history_keeps_only_the_most_recent_entries():
+    """Test that the history is bounded."""
+    pass
+
+
+@scenario("features/history.feature", "An out-of-range insert through the tools is recorded where it landed")
+def test_an_out_of_range_insert_through_the_tools_is_recorded_where_it_landed():
+    """Test undoing an insert whose index was clamped."""
+    pass
+
+
+@scenario("features/history.feature", "Undo, redo and history through the tools")
+def test_undo_redo_and_history_through_the_tools():
+    """Test the undo, redo and history tools."""
+    pass
+
+
+@scenario("features/history.feature", "A failed save leaves the history unchanged")
+def test_a_failed_save_leaves_the_history_unchanged():
+    """Test that undo only moves the history once the tour is saved."""
+    pass
+
+
+@scenario("features/history.feature", "A tour file that cannot be read is rebuilt by create_tour")
+def test_a_tour_file_that_cannot_be_read_is_rebuilt_by_create_tour():
+    """Test that create_tour overwrites a broken tour file, as it always could."""
+    pass
+
+
+@scenario("features/history.feature", "Looking at history does not keep a log for the tour")
+def test_looking_at_history_does_not_keep_a_log_for_the_tour():
+    """Test that read-only and failed calls do not create history logs."""
+    pass
+
+
+@scenario("features/history.feature", "Only the most recently edited tours keep their history")
+def test_only_the_most_recently_edited_tours_keep_their_history():
+    """Test that the server bounds the number of tours with history."""
+    pass
+
+
+@pytest.fixture
+def history():
+    """An empty undo/redo log."""
+    return TourHistory()
+
+
+# Given steps
+@given(parsers.parse('a tour directory "{tour_dir}"'), target_fixture="tour_directory")
+def tour_directory(temp_tour_dir, tour_dir):
+    """Create a tour directory."""
+    return temp_tour_dir
+
+
+@given('the tour at ".tours/history-tour.tour" has steps:')
+def tour_with_steps(tour_directory, tour_context, datatable):
+    """Create a tour with multiple steps from a table."""
+    full_path = tour_directory.parent / ".tours/history-tour.tour"
+
+    files = datatable[0][1:]
+    descriptions = datatable[1][1:]
+
+    steps = [{"file": file, "description": desc} for file, desc in zip(files, descriptions, strict=False)]
+    save_tour(str(full_path), {"title": "History Tour", "steps": steps})
+    tour_context["tour_path"] = str(full_path)
+
+
+@given(parsers.parse('the file "{path}" contains:'))
+def file_with_content(tour_directory, path, docstring):
+    """Write a file that need not be a valid tour."""
+    (tour_directory.parent / path).write_text(docstring, encoding="utf-8")
+
+
+@given(parsers.parse("the server keeps history for at most {count:d} tours"))
+def limited_histories(server_workspace, monkeypatch, count):
+    """Limit the number of tours the server keeps history for."""
+    monkeypatch.setattr(server, "histories", TourHistories(max_tours=count))
+
+
+@given(parsers.parse("a history limited to {count:d} entries"))
+def limited_history(history, count):
+    """Limit the number of entries the history keeps."""
+    history.max_entries = count
+
+
+# When steps
+@when(parsers.parse('I insert a step with file "{file}" at index {index:d} into "{path}"'))
+def insert_step(tour_directory, history, file, index, path):
+    """Insert a step and record it in the history."""
+    full_path = str(tour_directory.parent / path)
+    tour_data = load_tour(full_path)
+    step = {"file": file, "description": f"About {file}"}
+    tour_data["steps"].insert(index, step)
+    save_tour(full_path, tour_data)
+    history.record(insert_step_delta(index, step))
+
+
+@when(parsers.parse('I remove step {index:d} from "{path}" with history'))
+def remove_step(tour_directory, history, index, path):
+    """Remove a step and record it in the history."""
+    full_path = str(tour_directory.parent / path)
+    tour_data = load_tour(full_path)
+    removed = tour_data["steps"].pop(index)
+    save_tour(full_path, tour_data)
+    history.record(remove_step_delta(index, removed))
+
+
+@when(parsers.parse('I set the title of step {index:d} in "{path}" to "{title}"'))
+def set_step_title(tour_directory, history, index, path, title):
+    """Update a step's title and record it in the history."""
+    full_path = str(tour_directory.parent / path)
+    tour_data = load_tour(full_path)
+    before = {"title": tour_data["steps"][index].get("title")}
+    tour_data["steps"][index]["title"] = title
+    save_tour(full_path, tour_data)
+    history.record(update_step_delta(index, before, {"title": title}))
+
+
+@when(parsers.parse('I undo the last edit to "{path}"'))
+def undo_edit(tour_directory, history, path):
+    """Undo the most recent edit."""
+    full_path = str(tour_directory.parent / path)
+    _, tour_data = history.undo(load_tour(full_path))
+    save_tour(full_path, tour_data)
+
+
+@when(parsers.parse('I redo the last edit to "{path}"'))
+def redo_edit(tour_directory, history, path):
+    """Redo the most recently undone edit."""
+    full_path = str(tour_directory.parent / path)
+    _, tour_data = history.redo(load_tour(full_path))
+    save_tour(full_path, tour_data)
+
+
+@when(parsers.parse('the tour at "{path}" is edited outside the history'))
+def edit_outside_history(tour_directory, path):
+    """Change the tour without recording the edit."""
+    full_path = str(tour_directory.parent / path)
+    tour_data = load_tour(full_path)
+    tour_data["steps"].pop(1)
+    save_tour(full_path, tour_data)
+
+
+@when("saving tours fails")
+def saving_fails(monkeypatch):
+    """Make the server's tour writes fail."""
+
+    def fail(tour_path, tour_data, **kwargs):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(server, "save_tour", fail)
+
+
+# Then steps
+@then(parsers.parse("the tour should have {count:d} steps"))
+def tour_has_step_count(tour_context, count):
+    """Verify tour has the expected number of steps."""
+    tour_data = load_tour(tour_context["tour_path"])
+    assert len(tour_data["steps"]) == count
+
+
+@then(parsers.parse('step {index:d} should have file "{file}"'))
+def step_has_file(tour_context, index, file):
+    """Verify step has the expected file."""
+    tour_data = load_tour(tour_context["tour_path"])
+    assert tour_data["steps"][index]["file"] == file
+
+
+@then(parsers.parse("step {index:d} should have no title"))
+def step_has_no_title(tour_context, index):
+    """Verify step has no title."""
+    tour_data = load_tour(tour_context["tour_path"])
+    assert "title" not in tour_data["steps"][index]
+
+
+@then(parsers.parse('undoing the last edit to "{path}" should fail'))
+def undo_fails(tour_directory, history, path):
+    """Verify undo refuses to apply to a diverged tour."""
+    full_path = str(tour_directory.parent / path)
+    with pytest.raises(ValueError):
+        history.undo(load_tour(full_path))
+
+
+@then("the history should be empty")
+def history_is_empty(history):
+    """Verify nothing can be undone or redone."""
+    assert not history.can_undo
+    assert not history.can_redo
+
+
+@then(parsers.parse("the history should have {count:d} undoable entries"))
+def history_has_undo_count(history, count):
+    """Verify the number of undoable entries."""
+    assert len(history.entries()["undo"]) == count
+
+
+@then(parsers.parse('the tour at "{path}" should have title "{title}"'))
+def tour_title(tour_directory, path, title):
+    """Verify a tour's title on disk."""
+    assert load_tour(str(tour_directory.parent / path))["title"] == title
+
+
+@then(parsers.parse('"{path}" should not exist'))
+def file_missing(tour_directory, path):
+    """Verify a file has been removed."""
+    assert not (tour_directory.parent / path).exists()
+
+
+@then(parsers.parse("the server should keep history for {count:d} tours"))
+def history_count(count):
+    """Verify how many tours the server keeps history for."""
+    assert len(server.histories) == count
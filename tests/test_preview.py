@@ -0,0 +1,200 @@
+"""BDD step definitions for step previews."""
+
+import asyncio
+import json
+import textwrap
+
+import pytest
+from pytest_bdd import given, parsers, scenario, then, when
+
+from codetour_mcp.files import SourceFileCache
+from codetour_mcp.preview import preview_steps
+
+
+# Scenarios
+@scenario("features/preview.feature", "Preview a pattern step")
+def test_preview_a_pattern_step():
+    """Test previewing a pattern step."""
+    pass
+
+
+@scenario("features/preview.feature", "Preview a line step")
+def test_preview_a_line_step():
+    """Test previewing a line step."""
+    pass
+
+
+@scenario("features/preview.feature", "Report steps that cannot be resolved")
+def test_report_steps_that_cannot_be_resolved():
+    """Test previewing steps that cannot be resolved."""
+    pass
+
+
+@scenario("features/preview.feature", "Each file is read once per request")
+def test_each_file_is_read_once_per_request():
+    """Test that a file shared by steps is read once."""
+    pass
+
+
+@scenario("features/preview.feature", "Previews stop at the size limit")
+def test_previews_stop_at_the_size_limit():
+    """Test that previews are truncated at the size limit."""
+    pass
+
+
+@scenario("features/preview.feature", "A first preview larger than the size limit is clipped to fit")
+def test_a_first_preview_larger_than_the_size_limit_is_clipped_to_fit():
+    """Test that the size limit applies to the first preview."""
+    pass
+
+
+@scenario("features/preview.feature", "A first preview with a long file name is clipped to fit")
+def test_a_first_preview_with_a_long_file_name_is_clipped_to_fit():
+    """Test that the size limit also holds for previews without lines."""
+    pass
+
+
+@scenario("features/preview.feature", "Long lines are cut short")
+def test_long_lines_are_cut_short():
+    """Test that long lines are clipped."""
+    pass
+
+
+@scenario("features/preview.feature", "Steps with an invalid file are reported")
+def test_steps_with_an_invalid_file_are_reported():
+    """Test previewing a step whose file is not a string."""
+    pass
+
+
+@scenario("features/preview.feature", "Steps with a line that is not a finite number are reported")
+def test_steps_with_a_line_that_is_not_a_finite_number_are_reported():
+    """Test that an infinite or NaN line is a per-step error."""
+    pass
+
+
+@pytest.fixture
+def file_cache():
+    """A source file cache that is shut down after the test."""
+    cache = SourceFileCache()
+    yield cache
+    cache.close()
+
+
+# Given steps
+@given(parsers.parse('a source file "{path}" with content:'))
+def source_file(tmp_path, path, docstring):
+    """Create a source file."""
+    full_path = tmp_path / path
+    full_path.parent.mkdir(parents=True, exist_ok=True)
+    full_path.write_text(textwrap.dedent(docstring) + "\n", encoding="utf-8")
+
+
+@given(parsers.parse('a source file "{path}" with one line of {length:d} characters'))
+def long_line_file(tmp_path, path, length):
+    """Create a source file holding a single long line, like minified code."""
+    full_path = tmp_path / path
+    full_path.parent.mkdir(parents=True, exist_ok=True)
+    full_path.write_text("x" * length + "\n", encoding="utf-8")
+
+
+@given("a tour with a step:")
+def tour_step(tour_context, docstring):
+    """Create a tour with one step given as JSON."""
+    tour_context["tour_data"] = {"title": "Preview Tour", "steps": [json.loads(docstring)]}
+
+
+@given(parsers.parse("a tour with a step for a missing file whose path is {length:d} characters long"))
+def tour_step_long_path(tour_context, length):
+    """Create a tour with one step pointing at a file with a very long name."""
+    step = {"file": "missing/" + "x" * (length - len("missing/")), "description": "Gone"}
+    tour_context["tour_data"] = {"title": "Preview Tour", "steps": [step]}
+
+
+@given("a tour with steps:")
+def tour_steps(tour_context, datatable):
+    """Create tour steps from a table with a header row."""
+    keys = datatable[0]
+    steps = []
+    for row in datatable[1:]:
+        step = {"description": "A step"}
+        step.update(zip(keys, row, strict=True))
+        if "line" in step:
+            step["line"] = int(step["line"])
+        steps.append(step)
+    tour_context["tour_data"] = {"title": "Preview Tour", "steps": steps}
+
+
+# When steps
+@when(parsers.parse("I preview the steps with {context:d} line of context"))
+def preview_with_context(tmp_path, file_cache, tour_context, context):
+    """Preview all steps."""
+    steps = tour_context["tour_data"]["steps"]
+    tour_context["last_result"] = asyncio.run(preview_steps(steps, file_cache, context=context, root=tmp_path))
+
+
+@when(parsers.parse("I preview the steps with a limit of {max_bytes:d} bytes"))
+def preview_with_limit(tmp_path, file_cache, tour_context, max_bytes):
+    """Preview all steps within a size limit."""
+    steps = tour_context["tour_data"]["steps"]
+    tour_context["last_result"] = asyncio.run(
+        preview_steps(steps, file_cache, context=1, max_bytes=max_bytes, root=tmp_path)
+    )
+
+
+# Then steps
+@then(parsers.parse("preview {index:d} should point at line {line:d}"))
+def preview_points_at_line(tour_context, index, line):
+    """Verify the resolved line."""
+    assert tour_context["last_result"]["steps"][index]["line"] == line
+
+
+@then(parsers.parse("preview {index:d} should show lines {first:d} to {last:d}"))
+def preview_shows_lines(tour_context, index, first, last):
+    """Verify the window of lines shown."""
+    preview = tour_context["last_result"]["steps"][index]
+    assert preview["startLine"] == first
+    assert len(preview["lines"]) == last - first + 1
+
+
+@then(parsers.parse('preview {index:d} should have error "{error}"'))
+def preview_has_error(tour_context, index, error):
+    """Verify the preview reports an error."""
+    assert tour_context["last_result"]["steps"][index]["error"] == error
+
+
+@then(parsers.re(r"I should get (?P<count>\d+) previews?"), converters={"count": int})
+def preview_count(tour_context, count):
+    """Verify the number of previews."""
+    assert len(tour_context["last_result"]["steps"]) == count
+
+
+@then(parsers.re(r"the file cache should have read (?P<count>\d+) files?"), converters={"count": int})
+def files_read(file_cache, count):
+    """Verify how many files were read from disk."""
+    assert file_cache.misses == count
+    assert file_cache.hits == 0
+
+
+@then(parsers.parse("the previews should be truncated at step {index:d}"))
+def previews_truncated(tour_context, index):
+    """Verify the previews were truncated."""
+    assert tour_context["last_result"]["truncated"]
+    assert tour_context["last_result"]["next_index"] == index
+
+
+@then(parsers.parse("preview {index:d} should be clipped"))
+def preview_clipped(tour_context, index):
+    """Verify the preview's lines were cut short."""
+    assert tour_context["last_result"]["steps"][index]["clipped"]
+
+
+@then(parsers.parse("preview {index:d} should have no line longer than {length:d} characters"))
+def preview_line_lengths(tour_context, index, length):
+    """Verify the longest line shown."""
+    assert max(len(line) for line in tour_context["last_result"]["steps"][index]["lines"]) <= length
+
+
+@then(parsers.parse("the previews should fit in {max_bytes:d} bytes"))
+def previews_fit(tour_context, max_bytes):
+    """Verify the response, serialised as the server does, stays within the size limit."""
+    assert len(json.dumps(tour_context["last_result"], indent=2)) <= max_bytes
@@ -0,0 +1,157 @@
+"""BDD step definitions for source file access."""
+
+import asyncio
+
+import pytest
+from pytest_bdd import given, parsers, scenario, then, when
+
+from codetour_mcp.files import SourceFileCache
+
+
+# Scenarios
+@scenario("features/source_files.feature", "Read a window of lines")
+def test_read_a_window_of_lines():
+    """Test reading a window of lines."""
+    pass
+
+
+@scenario("features/source_files.feature", "An unchanged file is read only once")
+def test_an_unchanged_file_is_read_only_once():
+    """Test that cached files are reused."""
+    pass
+
+
+@scenario("features/source_files.feature", "A modified file is read again")
+def test_a_modified_file_is_read_again():
+    """Test that modified files are reloaded."""
+    pass
+
+
+@scenario("features/source_files.feature", "Large files are mapped instead of read into memory")
+def test_large_files_are_mapped_instead_of_read_into_memory():
+    """Test that large files are mapped."""
+    pass
+
+
+@scenario("features/source_files.feature", "Find the line matching a pattern")
+def test_find_the_line_matching_a_pattern():
+    """Test finding the line matching a pattern."""
+    pass
+
+
+@scenario("features/source_files.feature", "Find a pattern after multi-byte characters")
+def test_find_a_pattern_after_multi_byte_characters():
+    """Test mapping a match position to its line past non-ASCII text."""
+    pass
+
+
+@scenario("features/source_files.feature", "Missing files are reported as absent")
+def test_missing_files_are_reported_as_absent():
+    """Test reading missing files."""
+    pass
+
+
+@scenario("features/source_files.feature", "The cache stays within its size budget")
+def test_the_cache_stays_within_its_size_budget():
+    """Test that the cache evicts entries over its budget."""
+    pass
+
+
+@pytest.fixture
+def file_cache():
+    """A source file cache that is shut down after the test."""
+    cache = SourceFileCache()
+    yield cache
+    cache.close()
+
+
+def write_numbered_lines(path, count):
+    """Write a file whose lines are "line 1" to "line <count>"."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("".join(f"line {i}\n" for i in range(1, count + 1)), encoding="utf-8")
+
+
+# Given steps
+@given(parsers.parse('a source file "{path}" with {count:d} numbered lines'))
+def source_file(tmp_path, path, count):
+    """Create a source file."""
+    write_numbered_lines(tmp_path / path, count)
+
+
+@given(parsers.parse('a source file "{path}" with content:'))
+def source_file_with_content(tmp_path, path, docstring):
+    """Create a source file with the given content."""
+    file_path = tmp_path / path
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.write_text(docstring + "\n", encoding="utf-8")
+
+
+@given(parsers.parse("files of {threshold:d} bytes or more are mapped"))
+def mmap_threshold(file_cache, threshold):
+    """Set the size at which files are mapped."""
+    file_cache.mmap_threshold = threshold
+
+
+@given(parsers.parse("a file cache limited to {max_bytes:d} bytes"))
+def limited_cache(file_cache, max_bytes):
+    """Limit the cache size."""
+    file_cache.max_bytes = max_bytes
+
+
+# When steps
+@when(parsers.parse('I read lines {start:d} to {end:d} of "{path}"'))
+def read_lines(tmp_path, file_cache, tour_context, start, end, path):
+    """Read a window of lines."""
+    tour_context["last_result"] = asyncio.run(file_cache.read_lines(tmp_path / path, start, end))
+
+
+@when(parsers.parse('the source file "{path}" is rewritten with {count:d} numbered lines'))
+def rewrite_source_file(tmp_path, path, count):
+    """Rewrite a source file with different content."""
+    write_numbered_lines(tmp_path / path, count)
+
+
+@when(parsers.parse('I search "{path}" for "{pattern}"'))
+def search_file(tmp_path, file_cache, tour_context, path, pattern):
+    """Find the first line matching a pattern."""
+    tour_context["last_result"] = asyncio.run(file_cache.find(tmp_path / path, pattern))
+
+
+# Then steps
+@then(parsers.parse('I should get lines "{lines}"'))
+def lines_are(tour_context, lines):
+    """Verify the lines read."""
+    assert tour_context["last_result"] == lines.split(",")
+
+
+@then("I should get no lines")
+def no_lines(tour_context):
+    """Verify nothing was read."""
+    assert tour_context["last_result"] is None
+
+
+@then(
+    parsers.re(r"the file cache should have (?P<misses>\d+) miss(?:es)? and (?P<hits>\d+) hits?"),
+    converters={"misses": int, "hits": int},
+)
+def cache_counts(file_cache, misses, hits):
+    """Verify how often the cache read from disk."""
+    assert (file_cache.misses, file_cache.hits) == (misses, hits)
+
+
+@then(parsers.parse('"{path}" should be mapped'))
+def file_is_mapped(tmp_path, file_cache, path):
+    """Verify the file contents are not held in memory."""
+    assert asyncio.run(file_cache.get(tmp_path / path)).is_mapped
+
+
+@then(parsers.parse("the match should be on line {line:d}"))
+def match_on_line(tour_context, line):
+    """Verify the line of the first match."""
+    assert tour_context["last_result"] == line
+
+
+@then(parsers.parse('"{path}" should not exist'))
+def file_does_not_exist(tmp_path, file_cache, path):
+    """Verify the existence check."""
+    assert not asyncio.run(file_cache.exists(tmp_path / path))
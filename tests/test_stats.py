@@ -0,0 +1,195 @@
+"""BDD step definitions for tour statistics."""
+
+import threading
+import time
+
+from conftest import create_tour_file
+from pytest_bdd import given, parsers, scenario, then, when
+
+from codetour_mcp import core, stats
+from codetour_mcp.stats import find_tours, tour_stats
+
+
+# Scenarios
+@scenario("features/stats.feature", "Count tours and steps")
+def test_count_tours_and_steps():
+    """Test counting tours and steps."""
+    pass
+
+
+@scenario("features/stats.feature", "Count referenced files and directories")
+def test_count_referenced_files_and_directories():
+    """Test counting referenced files and directories."""
+    pass
+
+
+@scenario("features/stats.feature", "Describe description lengths")
+def test_describe_description_lengths():
+    """Test the description length distribution."""
+    pass
+
+
+@scenario("features/stats.feature", "Tours that cannot be loaded are reported")
+def test_tours_that_cannot_be_loaded_are_reported():
+    """Test reporting tours that fail to load."""
+    pass
+
+
+@scenario("features/stats.feature", "Dependency directories are not searched")
+def test_dependency_directories_are_not_searched():
+    """Test that dependency directories are skipped."""
+    pass
+
+
+@scenario("features/stats.feature", "Tours with step values of the wrong type are reported")
+def test_tours_with_step_values_of_the_wrong_type_are_reported():
+    """Test that tours failing validation are reported rather than counted."""
+    pass
+
+
+@scenario("features/stats.feature", "Computing statistics leaves the edit caches alone")
+def test_computing_statistics_leaves_the_edit_caches_alone():
+    """Test that bulk loading does not fill the caches used for edits."""
+    pass
+
+
+@scenario("features/stats.feature", "Only a few tours are held at once")
+def test_only_a_few_tours_are_held_at_once():
+    """Test that loads are submitted in a bounded window."""
+    pass
+
+
+# Given steps
+@given(parsers.parse('a tour directory "{tour_dir}"'), target_fixture="tour_directory")
+def tour_directory(temp_tour_dir, tour_dir):
+    """Create a tour directory."""
+    return temp_tour_dir
+
+
+@given(parsers.parse('a tour at "{path}" with steps:'))
+def tour_with_steps(tour_directory, path, datatable):
+    """Create a tour with steps from a table with a header row; empty cells are omitted."""
+    keys = datatable[0]
+    steps = [{key: value for key, value in zip(keys, row, strict=True) if value} for row in datatable[1:]]
+    create_tour_file(str(tour_directory.parent / path), "Stats Tour", steps=steps)
+
+
+@given(parsers.parse('a tour at "{path}" with no steps'))
+def tour_without_steps(tour_directory, path):
+    """Create a tour without steps."""
+    create_tour_file(str(tour_directory.parent / path), "Empty Tour")
+
+
+@given(parsers.parse('a file at "{path}" containing "{content}"'))
+def file_containing(tour_directory, path, content):
+    """Write raw content to a file."""
+    (tour_directory.parent / path).write_text(content, encoding="utf-8")
+
+
+@given(parsers.parse('a file at "{path}" containing:'))
+def file_containing_docstring(tour_directory, path, docstring):
+    """Write multi-line raw content to a file."""
+    (tour_directory.parent / path).write_text(docstring, encoding="utf-8")
+
+
+@given(parsers.parse('{count:d} more tours at "{directory}" with no steps'))
+def many_tours(tour_directory, count, directory):
+    """Create many empty tours."""
+    for n in range(count):
+        create_tour_file(str(tour_directory.parent / directory / f"tour-{n}.tour"), f"Tour {n}")
+
+
+@given("loads are tracked", target_fixture="load_tracker")
+def load_tracker(monkeypatch):
+    """Record the largest number of tours loaded or loading but not yet counted."""
+    tracker = {"held": 0, "peak": 0, "first": True}
+    lock = threading.Lock()
+    load = stats.load_tour_uncached
+
+    class CountedTour(dict):
+        def get(self, *args):
+            # Counting a tour starts by reading its steps
+            with lock:
+                tracker["held"] -= 1
+            self.get = super().get
+            return super().get(*args)
+
+    def tracked_load(path):
+        with lock:
+            tracker["held"] += 1
+            tracker["peak"] = max(tracker["peak"], tracker["held"])
+            first, tracker["first"] = tracker["first"], False
+        # A slow first load lets every other load finish meanwhile, if nothing holds them back
+        time.sleep(0.2 if first else 0.001)
+        return CountedTour(load(path))
+
+    monkeypatch.setattr(stats, "load_tour_uncached", tracked_load)
+    return tracker
+
+
+# When steps
+@when("I compute tour statistics")
+def compute_stats(tour_directory, tour_context):
+    """Compute statistics for the whole workspace."""
+    tour_context["last_result"] = tour_stats(tour_directory.parent)
+
+
+@when(parsers.parse("I compute tour statistics with {workers:d} workers"))
+def compute_stats_with_workers(tour_directory, tour_context, workers):
+    """Compute statistics with a given number of loader threads."""
+    tour_context["last_result"] = tour_stats(tour_directory.parent, max_workers=workers)
+
+
+# Then steps
+@then(parsers.parse("there should be {tours:d} tours with {steps:d} steps in total"))
+def tour_and_step_counts(tour_context, tours, steps):
+    """Verify the tour and step counts."""
+    assert tour_context["last_result"]["tours"] == tours
+    assert tour_context["last_result"]["steps"]["total"] == steps
+
+
+@then(parsers.parse('the empty tours should be "{paths}"'))
+def empty_tours(tour_context, paths):
+    """Verify which tours have no steps."""
+    assert tour_context["last_result"]["emptyTours"] == paths.split(",")
+
+
+@then(parsers.parse("{count:d} files should be covered"))
+def files_covered(tour_context, count):
+    """Verify the number of distinct files referenced."""
+    assert tour_context["last_result"]["files"]["covered"] == count
+
+
+@then(parsers.parse('the most referenced {kind} should be "{name}" with {count:d} references'))
+def most_referenced(tour_context, kind, name, count):
+    """Verify the most referenced file or directory."""
+    key = "files" if kind == "file" else "directories"
+    assert tour_context["last_result"][key]["top"][0] == (name, count)
+
+
+@then(parsers.parse('the description length histogram should have {short:d} in "{first}" and {long:d} in "{second}"'))
+def description_histogram(tour_context, short, first, long, second):
+    """Verify the description length histogram."""
+    histogram = tour_context["last_result"]["descriptionLength"]["histogram"]
+    assert histogram[first] == short
+    assert histogram[second] == long
+
+
+@then(parsers.parse('"{path}" should be reported as failed'))
+def reported_as_failed(tour_context, path):
+    """Verify a tour that failed to load is reported."""
+    assert [failure["path"] for failure in tour_context["last_result"]["failed"]] == [path]
+
+
+@then("no tour under the workspace should be in the edit caches")
+def not_in_edit_caches(tour_directory):
+    """Verify no tour's digest or content was recorded by computing statistics."""
+    for path in find_tours(tour_directory.parent):
+        assert str(path) not in core._file_digests
+        assert core.content_hash(path.read_bytes()) not in core._recent_versions
+
+
+@then(parsers.parse("at most {count:d} tours should have been held at once"))
+def loads_in_flight(load_tracker, count):
+    """Verify how many loads overlapped."""
+    assert 0 < load_tracker["peak"] <= count
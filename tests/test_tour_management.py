@@ -1,10 +1,12 @@
 """BDD step definitions for tour management."""
 
+import hashlib
 from pathlib import Path
 
 from conftest import create_tour_file
 from pytest_bdd import given, parsers, scenario, then, when
 
+from codetour_mcp import core
 from codetour_mcp.core import load_tour, save_tour
 
 
@@ -33,6 +35,24 @@ def test_list_tours_in_directory():
     pass
 
 
+@scenario("features/tour_management.feature", "Saving an unchanged tour leaves the file untouched")
+def test_saving_an_unchanged_tour_leaves_the_file_untouched():
+    """Test that a no-op save does not rewrite the file."""
+    pass
+
+
+@scenario("features/tour_management.feature", "Saving a changed tour rewrites the file")
+def test_saving_a_changed_tour_rewrites_the_file():
+    """Test that a changed tour is written."""
+    pass
+
+
+@scenario("features/tour_management.feature", "A write while a tour is being read is not hidden by the hash cache")
+def test_a_write_while_a_tour_is_being_read_is_not_hidden_by_the_hash_cache():
+    """Test that a digest is never cached under the stat of a later write."""
+    pass
+
+
 # Given steps
 @given(parsers.parse('a tour directory "{tour_dir}"'), target_fixture="tour_directory")
 def tour_directory(temp_tour_dir, tour_dir):
@@ -52,6 +72,19 @@ def existing_tour(temp_tour_dir, path, title):
     return str(full_path)
 
 
+@given(parsers.parse('another process retitles it "{title}" while it is being read'))
+def write_while_reading(existing_tour_path, monkeypatch, title):
+    """Rewrite the tour from outside, just after its content has been read for hashing."""
+    content_hash = core.content_hash
+
+    def hash_then_write(content):
+        monkeypatch.setattr(core, "content_hash", content_hash)
+        create_tour_file(existing_tour_path, title)
+        return content_hash(content)
+
+    monkeypatch.setattr(core, "content_hash", hash_then_write)
+
+
 # When steps
 @when(parsers.parse('I create a tour with path "{path}" and title "{title}"'))
 def create_tour(tour_directory, tour_context, path, title):
@@ -96,6 +129,18 @@ def list_tours(tour_directory, tour_context, dir):
     tour_context["tour_list"] = tours
 
 
+@when(parsers.parse('I save the tour at "{path}" with title "{title}"'))
+def save_tour_with_title(temp_tour_dir, tour_context, path, title):
+    """Load a tour, set its title and save it."""
+    full_path = temp_tour_dir.parent / path
+    tour_data = load_tour(str(full_path))
+    tour_data["title"] = title
+    mtime_before = full_path.stat().st_mtime_ns
+    tour_context["last_result"] = save_tour(str(full_path), tour_data)
+    tour_context["mtime_changed"] = full_path.stat().st_mtime_ns != mtime_before
+    tour_context["tour_path"] = str(full_path)
+
+
 # Then steps
 @then(parsers.parse('the tour file should exist at "{path}"'))
 def tour_file_exists(tour_directory, path):
@@ -143,3 +188,23 @@ def tour_list_contains_path(tour_directory, tour_context, path):
     full_path = str(tour_directory.parent / path)
     paths = [tour["path"] for tour in tour_context["tour_list"]]
     assert full_path in paths
+
+
+@then("the tour file should not have been rewritten")
+def tour_file_not_rewritten(tour_context):
+    """Verify the save was skipped."""
+    assert tour_context["last_result"] is False
+    assert not tour_context["mtime_changed"]
+
+
+@then("the tour file should have been rewritten")
+def tour_file_rewritten(tour_context):
+    """Verify the save wrote the file."""
+    assert tour_context["last_result"] is True
+
+
+@then(parsers.parse('the hash of "{path}" should match its content'))
+def hash_matches_content(temp_tour_dir, path):
+    """Verify the cached digest describes what is on disk."""
+    full_path = temp_tour_dir.parent / path
+    assert core.file_digest(str(full_path)) == hashlib.sha256(full_path.read_bytes()).hexdigest()
@@ -0,0 +1,126 @@
+"""BDD step definitions for schema validation."""
+
+import textwrap
+
+import pytest
+from pytest_bdd import given, parsers, scenario, then, when
+
+from codetour_mcp.core import load_tour, save_tour
+from codetour_mcp.schema import TourValidationError
+
+
+# Scenarios
+@scenario("features/validation.feature", "A conforming tour passes strict validation")
+def test_a_conforming_tour_passes_strict_validation():
+    """Test that a conforming tour passes strict validation."""
+    pass
+
+
+@scenario("features/validation.feature", "A tour that is not an object is rejected in either mode")
+def test_a_tour_that_is_not_an_object_is_rejected_in_either_mode():
+    """Test that a non-object tour is rejected."""
+    pass
+
+
+@scenario("features/validation.feature", "A step without a description is rejected in strict mode")
+def test_a_step_without_a_description_is_rejected_in_strict_mode():
+    """Test that strict mode requires step descriptions."""
+    pass
+
+
+@scenario("features/validation.feature", "A step without a description is accepted in lenient mode")
+def test_a_step_without_a_description_is_accepted_in_lenient_mode():
+    """Test that lenient mode accepts steps without descriptions."""
+    pass
+
+
+@scenario("features/validation.feature", "Step fields the tools read are type-checked in lenient mode")
+def test_step_fields_the_tools_read_are_type_checked_in_lenient_mode():
+    """Test that lenient mode rejects values the tools would crash on."""
+    pass
+
+
+@scenario("features/validation.feature", "Tools report a tour they cannot work with as invalid")
+def test_tools_report_a_tour_they_cannot_work_with_as_invalid():
+    """Test that a tool fails with a validation error rather than deep inside its handler."""
+    pass
+
+
+@scenario("features/validation.feature", "Field types are checked in strict mode")
+def test_field_types_are_checked_in_strict_mode():
+    """Test that strict mode checks field types."""
+    pass
+
+
+@scenario("features/validation.feature", "An invalid tour is not saved")
+def test_an_invalid_tour_is_not_saved():
+    """Test that invalid tours are not written."""
+    pass
+
+
+@scenario("features/validation.feature", "An edit that breaks the step it changed is not saved")
+def test_an_edit_that_breaks_the_step_it_changed_is_not_saved():
+    """Test that saving an edit validates the steps it changed."""
+    pass
+
+
+# Given steps
+@given(parsers.parse('a tour directory "{tour_dir}"'), target_fixture="tour_directory")
+def tour_directory(temp_tour_dir, tour_dir):
+    """Create a tour directory."""
+    return temp_tour_dir
+
+
+@given(parsers.parse('a tour file "{path}" containing:'))
+def tour_file_containing(tour_directory, path, docstring):
+    """Write raw JSON to a tour file."""
+    (tour_directory.parent / path).write_text(textwrap.dedent(docstring), encoding="utf-8")
+
+
+# When steps
+@when(parsers.parse('I load "{path}" with {mode} validation'))
+def load_with_validation(tour_directory, tour_context, path, mode):
+    """Load a tour, recording any validation error."""
+    try:
+        tour_context["tour_data"] = load_tour(str(tour_directory.parent / path), validation=mode)
+    except TourValidationError as e:
+        tour_context["last_result"] = e
+
+
+@when(parsers.parse('I save a tour without a title to "{path}" with {mode} validation'))
+def save_without_title(tour_directory, tour_context, path, mode):
+    """Save an invalid tour, recording the validation error."""
+    with pytest.raises(TourValidationError) as excinfo:
+        save_tour(str(tour_directory.parent / path), {"steps": []}, validation=mode)
+    tour_context["last_result"] = excinfo.value
+
+
+@when(parsers.parse('I save "{path}" with step {index:d} given a numeric description, with {mode} validation'))
+def save_edited_step(tour_directory, tour_context, path, index, mode):
+    """Break one step of the loaded tour and save it as the only changed step."""
+    tour_context["tour_data"]["steps"][index]["description"] = 42
+    with pytest.raises(TourValidationError) as excinfo:
+        save_tour(str(tour_directory.parent / path), tour_context["tour_data"], validation=mode, changed_steps=[index])
+    tour_context["last_result"] = excinfo.value
+
+
+# Then steps
+@then("the tour should load")
+def tour_loaded(tour_context):
+    """Verify the tour loaded without errors."""
+    assert tour_context["last_result"] is None
+    assert isinstance(tour_context["tour_data"], dict)
+
+
+@then(parsers.parse('loading should fail with "{error}"'))
+@then(parsers.parse('saving should fail with "{error}"'))
+def failed_with(tour_context, error):
+    """Verify the validation error reports the expected problem."""
+    assert isinstance(tour_context["last_result"], TourValidationError)
+    assert error in tour_context["last_result"].errors
+
+
+@then(parsers.parse('no tour file should exist at "{path}"'))
+def no_tour_file(tour_directory, path):
+    """Verify the tour file was not written."""
+    assert not (tour_directory.parent / path).exists()
@@ -0,0 +1,194 @@
+"""BDD step definitions for workspace path resolution."""
+
+import json
+import sys
+
+import pytest
+from conftest import call_tool, create_tour_file, load_tour_file
+from pytest_bdd import given, parsers, scenario, then, when
+
+from codetour_mcp import server
+from codetour_mcp.paths import WorkspacePaths
+
+
+# Scenarios
+@scenario("features/workspace_paths.feature", "Different spellings resolve to the same tour")
+def test_different_spellings_resolve_to_the_same_tour():
+    """Test that equivalent paths resolve to one canonical path."""
+    pass
+
+
+@scenario("features/workspace_paths.feature", "Paths through a symlinked directory resolve to their target")
+def test_paths_through_a_symlinked_directory_resolve_to_their_target():
+    """Test that symlinks are resolved."""
+    pass
+
+
+@scenario(
+    "features/workspace_paths.feature", "Relative paths are taken from the workspace root, not the current directory"
+)
+def test_relative_paths_are_taken_from_the_workspace_root():
+    """Test that relative paths use the workspace root."""
+    pass
+
+
+@scenario("features/workspace_paths.feature", "Resolved paths are memoised")
+def test_resolved_paths_are_memoised():
+    """Test that repeated resolutions are served from the memo."""
+    pass
+
+
+@scenario("features/workspace_paths.feature", "Missing paths are resolved again once they exist")
+def test_missing_paths_are_resolved_again_once_they_exist():
+    """Test that missing paths are not memoised."""
+    pass
+
+
+@scenario("features/workspace_paths.feature", "Paths are shown relative to the workspace root")
+def test_paths_are_shown_relative_to_the_workspace_root():
+    """Test displaying canonical paths relative to the workspace root."""
+    pass
+
+
+@scenario("features/workspace_paths.feature", "Edits through different spellings of a tour share its history")
+def test_edits_through_different_spellings_of_a_tour_share_its_history():
+    """Test that the tools key per-tour history by canonical path."""
+    pass
+
+
+@scenario("features/workspace_paths.feature", "A hash read through one spelling is accepted through another")
+def test_a_hash_read_through_one_spelling_is_accepted_through_another():
+    """Test that the tools key content hashes by canonical path."""
+    pass
+
+
+@scenario("features/workspace_paths.feature", "Tools resolve paths against the configured workspace root")
+def test_tools_resolve_paths_against_the_configured_workspace_root():
+    """Test the tools with a workspace root other than the current directory."""
+    pass
+
+
+@scenario("features/workspace_paths.feature", "The workspace root can be set on the command line")
+def test_the_workspace_root_can_be_set_on_the_command_line():
+    """Test the --workspace-root option."""
+    pass
+
+
+@pytest.fixture
+def resolved_paths():
+    """Canonical paths returned by the resolver, in order."""
+    return []
+
+
+# Given steps
+@given(parsers.parse('a workspace with a tour at "{path}"'), target_fixture="workspace")
+def workspace(tmp_path, path):
+    """Create a workspace holding one tour and a resolver rooted at it."""
+    root = tmp_path / "workspace"
+    (root / "src").mkdir(parents=True)
+    create_tour_file(str(root / path), "Workspace Tour")
+    return WorkspacePaths(root)
+
+
+@given(parsers.parse('a symlink "{link}" to "{target}"'))
+@when(parsers.parse('a symlink "{link}" to "{target}" is created'))
+def symlink(workspace, link, target):
+    """Create a symlink inside the workspace."""
+    (workspace.root / link).symlink_to(workspace.root / target)
+
+
+@given("the current directory is somewhere else")
+def elsewhere(tmp_path, monkeypatch):
+    """Change to a directory outside the workspace."""
+    other = tmp_path / "elsewhere"
+    other.mkdir()
+    monkeypatch.chdir(other)
+
+
+@given("the server runs from the workspace")
+def server_in_workspace(server_workspace, workspace, monkeypatch):
+    """Start the server's tools from the workspace, with no explicit root."""
+    monkeypatch.chdir(workspace.root)
+
+
+@given("the server's workspace root is the workspace")
+def server_workspace_root(server_workspace, workspace):
+    """Set the server's workspace root, as --workspace-root does."""
+    server.workspace.set_root(workspace.root)
+
+
+@given(parsers.parse('the workspace has a file "{path}" containing "{content}"'))
+def workspace_file(workspace, path, content):
+    """Write a source file into the workspace."""
+    (workspace.root / path).write_text(content + "\n", encoding="utf-8")
+
+
+@given(parsers.parse('I note the hash of "{path}" through the tools'))
+def note_hash(server_workspace, tour_context, path):
+    """Read a tour's hash through the read_tour tool."""
+    tour_context["hash"] = json.loads(call_tool("read_tour", {"path": path, "with_hash": True}))["hash"]
+
+
+# When steps
+@when(parsers.parse('I resolve "{path}"'))
+def resolve(workspace, resolved_paths, path):
+    """Resolve a path against the workspace."""
+    resolved_paths.append(workspace.resolve(path))
+
+
+@when(parsers.parse('I resolve the absolute path of "{path}"'))
+def resolve_absolute(workspace, resolved_paths, path):
+    """Resolve an absolute path."""
+    resolved_paths.append(workspace.resolve(str(workspace.root / path)))
+
+
+@when(parsers.parse('I run the "{command}" command with the workspace root set to the workspace'))
+def run_command(server_workspace, workspace, tour_context, monkeypatch, capsys, command):
+    """Run the codetour-mcp command line and keep what it prints."""
+    monkeypatch.setattr(sys, "argv", ["codetour-mcp", "--workspace-root", str(workspace.root), command])
+    server.main()
+    tour_context["last_result"] = capsys.readouterr().out
+
+
+# Then steps
+@then(parsers.parse('every path should resolve to "{path}" in the workspace'))
+def all_resolve_to(workspace, resolved_paths, path):
+    """Verify every resolution produced the same canonical path."""
+    assert resolved_paths
+    assert set(resolved_paths) == {str(workspace.root / path)}
+
+
+@then(parsers.parse('the last path should resolve to "{path}" in the workspace'))
+def last_resolves_to(workspace, resolved_paths, path):
+    """Verify the most recent resolution."""
+    assert resolved_paths[-1] == str(workspace.root / path)
+
+
+@then(
+    parsers.re(r"the resolver should have (?P<misses>\d+) miss(es)? and (?P<hits>\d+) hits?"),
+    converters={"misses": int, "hits": int},
+)
+def resolver_counts(workspace, misses, hits):
+    """Verify how many resolutions went to the filesystem."""
+    assert (workspace.misses, workspace.hits) == (misses, hits)
+
+
+@then(parsers.parse('the last path should be shown as "{path}"'))
+def shown_as(workspace, resolved_paths, path):
+    """Verify the path relative to the workspace root."""
+    assert workspace.relative(resolved_paths[-1]) == path
+
+
+@then(
+    parsers.re(r'the tour at "(?P<path>[^"]+)" in the workspace should have (?P<count>\d+) steps?'),
+    converters={"count": int},
+)
+def workspace_tour_steps(workspace, path, count):
+    """Verify the number of steps in a tour inside the workspace."""
+    assert len(load_tour_file(str(workspace.root / path))["steps"]) == count
+
+
+@then(parsers.re(r"the printed statistics should count (?P<count>\d+) tours?"), converters={"count": int})
+def printed_tour_count(tour_context, count):
+    """Verify the tour count printed by the stats command."""
+    assert json.loads(tour_context["last_result"])["tours"] == count